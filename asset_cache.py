@@ -0,0 +1,224 @@
+import atexit
+import hashlib
+import json
+import os
+import struct
+import sys
+import threading
+from collections import OrderedDict
+from PyQt5.QtGui import QImage, QPixmap
+
+from core_utils import ConfigManager
+
+MAGIC = b"MMGC"
+HEADER = struct.Struct("<4sIII")  # magic, width, height, bytes per line
+MAX_FILES = 256
+BUNDLE_DIR = "compiled"         # asset_pipeline.py output, inside the asset directory
+BUNDLE_FORMAT = "argb32-premultiplied-le"
+
+
+def default_cache_dir():
+    """Cache lives next to layout_config.json."""
+    return os.path.join(os.path.dirname(ConfigManager.config_file), ".glyph_cache")
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def read_argb(path, width=None, height=None):
+    """QPixmap from a raw premultiplied ARGB32 file, or None if it is missing, corrupt or the wrong size."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) < HEADER.size:
+        return None
+    magic, w, h, bpl = HEADER.unpack_from(data)
+    if magic != MAGIC or len(data) != HEADER.size + bpl * h:
+        return None
+    if width is not None and (w, h) != (width, height):
+        return None
+    # copy(): the wrapped QImage does not own `data`, and fromImage may share it
+    image = QImage(data[HEADER.size:], w, h, bpl, QImage.Format_ARGB32_Premultiplied).copy()
+    return QPixmap.fromImage(image)
+
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0  # Removed meanwhile; sorts first and its removal below is a no-op
+
+
+class DiskGlyphCache:
+    """Pre-scaled glyphs from earlier sessions, stored as raw premultiplied ARGB32.
+
+    Entries are keyed by source path, mtime, file size and target pixel size,
+    so an edited asset or a new layout simply misses. Loading an entry is a
+    file read plus a QImage wrap: no PNG decode, no resampling. Stores are
+    written (and the cache pruned) on a worker thread, like ConfigWriter.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._cond = threading.Condition()
+        self._pending = OrderedDict()  # entry path -> QImage waiting to be written
+        self._busy = False
+        self._thread = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self.prune()
+        except OSError as e:
+            print(f"Glyph cache unavailable: {e}")
+            self.cache_dir = None
+
+    def _entry_path(self, source, width, height):
+        path, mtime_ns, size = source
+        key = f"{path}|{mtime_ns}|{size}|{width}x{height}"
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".argb")
+
+    def load(self, source, width, height):
+        """QPixmap of width x height device pixels, or None on a miss."""
+        if self.cache_dir is None:
+            return None
+        entry = self._entry_path(source, width, height)
+        with self._cond:
+            queued = self._pending.get(entry)
+        pixmap = QPixmap.fromImage(queued) if queued is not None else read_argb(entry, width, height)
+        if pixmap is None:
+            self.misses += 1
+            return None
+        try:
+            os.utime(entry)  # Recently used entries survive prune()
+        except OSError:
+            pass
+        self.hits += 1
+        return pixmap
+
+    def store(self, source, pixmap):
+        """Queue a scaled glyph for writing; returns at once (the file I/O runs on the worker)."""
+        if self.cache_dir is None:
+            return
+        # QPixmap is GUI-thread only; the worker gets a QImage
+        image = pixmap.toImage().convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        entry = self._entry_path(source, image.width(), image.height())
+        with self._cond:
+            self._pending[entry] = image
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="glyph-cache-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+            self._cond.notify()
+
+    def flush(self):
+        """Block until every queued store is on disk."""
+        with self._cond:
+            while self._pending or self._busy:
+                self._cond.wait()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                entry, image = self._pending.popitem(last=False)
+                self._busy = True
+            try:
+                self._write(entry, image)
+                if not self._pending:
+                    self.prune()
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _write(self, entry, image):
+        tmp = entry + ".tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(HEADER.pack(MAGIC, image.width(), image.height(), image.bytesPerLine()))
+                f.write(image.constBits().asstring(image.sizeInBytes()))
+            os.replace(tmp, entry)
+            self.writes += 1
+        except OSError as e:
+            print(f"Glyph cache write error: {e}")
+
+    def prune(self, max_files=MAX_FILES):
+        """Keep only the most recently used entries."""
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        entries = [os.path.join(self.cache_dir, name) for name in names if name.endswith(".argb")]
+        if len(entries) <= max_files:
+            return
+        entries.sort(key=_mtime)
+        for entry in entries[:len(entries) - max_files]:
+            try:
+                os.remove(entry)
+            except OSError:
+                pass
+
+
+class AssetBundle:
+    """Glyphs compiled ahead of time by asset_pipeline.py (asset_dir/compiled).
+
+    Holds each source at full size and at the default layout's sizes, already
+    premultiplied, so loading one is a file read: no PNG decode, no resample.
+    A glyph's entries are only used while its source file is the one they
+    were compiled from (same size and mtime, or else same content hash).
+    """
+
+    def __init__(self, asset_dir):
+        self.bundle_dir = os.path.join(asset_dir, BUNDLE_DIR)
+        self.glyphs = {}
+        self.hits = 0
+        self._valid = {}  # (glyph, source id) -> bool
+        try:
+            with open(os.path.join(self.bundle_dir, "manifest.json"), "r") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return
+        if manifest.get("format") != BUNDLE_FORMAT or sys.byteorder != "little":
+            return
+        self.glyphs = manifest.get("glyphs", {})
+
+    def __bool__(self):
+        return bool(self.glyphs)
+
+    def _is_current(self, glyph, source_id):
+        key = (glyph, source_id)
+        if key not in self._valid:
+            recorded = self.glyphs[glyph]["source"]
+            path, mtime_ns, size = source_id
+            valid = recorded["size"] == size
+            if valid and recorded["mtime_ns"] != mtime_ns:
+                # Copies and checkouts change mtimes; fall back to the content
+                try:
+                    valid = file_sha256(path) == recorded["sha256"]
+                except OSError:
+                    valid = False
+            self._valid[key] = valid
+        return self._valid[key]
+
+    def load(self, glyph, source_id, width=None, height=None):
+        """Compiled pixmap of width x height pixels (None = full size), or None."""
+        if source_id is None or glyph not in self.glyphs or not self._is_current(glyph, source_id):
+            return None
+        tier = "full" if width is None else f"{width}x{height}"
+        filename = self.glyphs[glyph]["tiers"].get(tier)
+        if filename is None:
+            return None
+        pixmap = read_argb(os.path.join(self.bundle_dir, filename), width, height)
+        if pixmap is not None:
+            self.hits += 1
+        return pixmap
@@ -0,0 +1,169 @@
+"""Build-time asset compiler: PNGs -> premultiplied, pre-scaled bundle + ICO.
+
+Writes asset_dir/compiled/ (see asset_cache.AssetBundle): every glyph at
+full size and at the default layout's slot sizes for common display scale
+factors, as raw premultiplied ARGB32 the app loads without decoding or
+resampling. Also converts icon.png to icon.ico.
+
+Inputs are tracked by content hash in compiled/manifest.json; unchanged
+inputs are skipped and changed ones are compiled in parallel.
+
+Usage:
+    python asset_pipeline.py [--assets assets] [--workers N] [--force]
+"""
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from asset_cache import BUNDLE_DIR, BUNDLE_FORMAT, HEADER, MAGIC, file_sha256
+from assets import GLYPH_FILES
+DPR_TIERS = (1.0, 1.25, 1.5, 2.0)  # Common Windows display scale factors
+ICON_SIZES = [(256, 256)]
+
+
+def layout_tiers(window_size):
+    """Pixel sizes each glyph is shown at in the default layout, per DPR tier."""
+    from layout_helper import LayoutHelper
+
+    w, h = window_size
+    rects = LayoutHelper.compute_slot_rects(w, h)
+    logical = {str(i): rects[0].size() for i in range(10)}
+    logical["colon"] = rects[2].size()
+    tiers = {glyph: sorted({(round(s.width() * dpr), round(s.height() * dpr)) for dpr in DPR_TIERS})
+             for glyph, s in logical.items()}
+    tiers["bg"] = sorted({(round(w * dpr), round(h * dpr)) for dpr in DPR_TIERS})
+    return tiers
+
+
+def _write_argb(path, image):
+    """PIL image -> raw premultiplied ARGB32 (little-endian BGRA bytes), replaced atomically."""
+    pixels = image.convert("RGBA").convert("RGBa").tobytes("raw", "BGRa")
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, image.width, image.height, image.width * 4))
+        f.write(pixels)
+    os.replace(tmp, path)
+
+
+def compile_glyph(job):
+    """Worker: one source PNG -> its full-size and per-tier .argb files. Returns {tier: filename}."""
+    from PIL import Image
+
+    glyph, src, out_dir, sizes = job
+    source = Image.open(src).convert("RGBA")
+    outputs = {}
+    filename = f"{glyph}_full.argb"
+    _write_argb(os.path.join(out_dir, filename), source)
+    outputs["full"] = filename
+    for w, h in sizes:
+        filename = f"{glyph}_{w}x{h}.argb"
+        # Resample in premultiplied space so transparent edges do not bleed dark fringes
+        scaled = source.convert("RGBa").resize((w, h), Image.LANCZOS).convert("RGBA")
+        _write_argb(os.path.join(out_dir, filename), scaled)
+        outputs[f"{w}x{h}"] = filename
+    return outputs
+
+
+def compile_icon(job):
+    from PIL import Image
+
+    src, dst = job
+    Image.open(src).save(dst, format="ICO", sizes=ICON_SIZES)
+    return dst
+
+
+def build(asset_dir="assets", window_size=(600, 240), workers=None, force=False):
+    """Compile what changed since the last run; returns (compiled, skipped) job counts."""
+    started = time.perf_counter()
+    out_dir = os.path.join(asset_dir, BUNDLE_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, "manifest.json")
+    try:
+        with open(manifest_path, "r") as f:
+            old = json.load(f)
+    except (OSError, ValueError):
+        old = {}
+    if old.get("format") != BUNDLE_FORMAT:
+        old = {}
+    old_glyphs = old.get("glyphs", {})
+
+    tiers = layout_tiers(window_size)
+    glyphs = {}
+    jobs = []
+    skipped = 0
+    for glyph, filename in GLYPH_FILES.items():
+        src = os.path.join(asset_dir, filename)
+        if not os.path.exists(src):
+            continue
+        st = os.stat(src)
+        source = {"file": filename, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": file_sha256(src)}
+        sizes = tiers[glyph]
+        previous = old_glyphs.get(glyph)
+        expected = {"full"} | {f"{w}x{h}" for w, h in sizes}
+        if (not force and previous is not None
+                and previous["source"]["sha256"] == source["sha256"]
+                and set(previous["tiers"]) == expected
+                and all(os.path.exists(os.path.join(out_dir, name)) for name in previous["tiers"].values())):
+            glyphs[glyph] = {"source": source, "tiers": previous["tiers"]}
+            skipped += 1
+            continue
+        glyphs[glyph] = {"source": source, "tiers": None}
+        jobs.append((glyph, src, out_dir, sizes))
+
+    icon = None
+    icon_job = None
+    icon_png = os.path.join(asset_dir, "icon.png")
+    icon_ico = os.path.join(asset_dir, "icon.ico")
+    if os.path.exists(icon_png):
+        icon = {"sha256": file_sha256(icon_png)}
+        if force or old.get("icon") != icon or not os.path.exists(icon_ico):
+            icon_job = (icon_png, icon_ico)
+        else:
+            skipped += 1
+
+    compiled = len(jobs) + (icon_job is not None)
+    if compiled:
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, compiled)) as pool:
+            icon_future = pool.submit(compile_icon, icon_job) if icon_job else None
+            for job, outputs in zip(jobs, pool.map(compile_glyph, jobs)):
+                glyphs[job[0]]["tiers"] = outputs
+            if icon_future is not None:
+                try:
+                    icon_future.result()
+                except Exception as e:
+                    print(f"Failed to generate ICO: {e}")
+                    icon = None
+
+    # Drop outputs no glyph refers to any more (old layouts, removed files)
+    current = {name for g in glyphs.values() for name in g["tiers"].values()}
+    for name in os.listdir(out_dir):
+        if name.endswith(".argb") and name not in current:
+            os.remove(os.path.join(out_dir, name))
+
+    manifest = {"format": BUNDLE_FORMAT, "window_size": list(window_size), "glyphs": glyphs, "icon": icon}
+    tmp = manifest_path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, manifest_path)
+    print(f"Assets: {compiled} compiled, {skipped} unchanged in {time.perf_counter() - started:.2f} s")
+    return compiled, skipped
+
+
+def main(argv):
+    import argparse
+    from core_utils import ConfigManager
+
+    parser = argparse.ArgumentParser(description="Compile assets into a premultiplied, pre-scaled bundle")
+    parser.add_argument("--assets", default="assets", help="asset directory (default: assets)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--force", action="store_true", help="recompile everything")
+    args = parser.parse_args(argv)
+    window_size = ConfigManager.load_config()["window_size"]
+    build(args.assets, window_size, args.workers, args.force)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,97 @@
+import os
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, QFileSystemWatcher, pyqtSignal
+from PyQt5.QtGui import QImage
+
+from assets import GLYPH_FILES
+
+
+class _DecodeSignals(QObject):
+    done = pyqtSignal(object)
+
+
+class _DecodeTask(QRunnable):
+    """Decodes changed PNGs on a pool thread (QImage is safe off the GUI thread, QPixmap is not)."""
+
+    def __init__(self, changes):
+        super().__init__()
+        self.changes = changes
+        self.signals = _DecodeSignals()
+
+    def run(self):
+        results = []
+        for glyph, source_id in self.changes:
+            image = QImage(source_id[0]) if source_id is not None else None
+            results.append((glyph, source_id, image))
+        self.signals.done.emit(results)
+
+
+class AssetWatcher(QObject):
+    """Hot-reloads edited files in an AssetLoader's asset_dir.
+
+    File events are debounced, only files whose mtime/size changed are
+    decoded (off the GUI thread), and assets_changed tells listeners which
+    glyphs to refresh; every other cached glyph stays warm.
+    """
+    assets_changed = pyqtSignal(list)
+    DEBOUNCE_MS = 300
+
+    def __init__(self, loader, parent=None):
+        super().__init__(parent)
+        self.loader = loader
+        self._pending = {}  # glyph -> source id being decoded; stale results are dropped
+        self._tasks = set()
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.timeout.connect(self.scan)
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._schedule)
+        self._watcher.fileChanged.connect(self._schedule)
+        if os.path.isdir(loader.asset_dir):
+            self._watcher.addPath(loader.asset_dir)
+        self._watch_files()
+
+    def _watch_files(self):
+        # Editors often replace files on save, which drops them from the watcher
+        watched = set(self._watcher.files())
+        for path in self.loader.paths.values():
+            if path not in watched:
+                self._watcher.addPath(path)
+
+    def _schedule(self, _path=None):
+        self._debounce.start(self.DEBOUNCE_MS)
+
+    def scan(self):
+        changes = []
+        for glyph, filename in GLYPH_FILES.items():
+            path = os.path.join(self.loader.asset_dir, filename)
+            try:
+                st = os.stat(path)
+                source_id = (path, st.st_mtime_ns, st.st_size)
+            except OSError:
+                source_id = None
+            known = self._pending.get(glyph, self.loader.sources.get(glyph))
+            if source_id != known:
+                self._pending[glyph] = source_id
+                changes.append((glyph, source_id))
+        if not changes:
+            return
+        task = _DecodeTask(changes)
+        task.signals.done.connect(self._apply)
+        self._tasks.add(task)
+        QThreadPool.globalInstance().start(task)
+
+    def _apply(self, results):
+        self._tasks = {t for t in self._tasks if t.signals is not self.sender()}
+        changed = []
+        for glyph, source_id, image in results:
+            if self._pending.get(glyph) != source_id:
+                continue  # A newer change of this file is still decoding
+            del self._pending[glyph]
+            self.loader.replace_source(glyph, source_id, image)
+            changed.append(glyph)
+        self._watch_files()
+        if changed:
+            print(f"Reloaded assets: {', '.join(changed)}")
+            self.assets_changed.emit(changed)
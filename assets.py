@@ -1,18 +1,164 @@
 import os
+from collections import OrderedDict
+from PyQt5.QtCore import Qt, QSize
 from PyQt5.QtGui import QPixmap
 from utils import resource_path
 
+
+class ScaledPixmapCache:
+    """LRU of pre-scaled glyph pixmaps, keyed by (glyph, target size, device pixel ratio).
+
+    Bounded by entry count and by pixel memory, not by pixel ratio: windows
+    on screens with different scale factors all stay warm, and a screen a
+    window has left is only evicted once its entries are the least recently
+    used.
+    """
+
+    def __init__(self, max_entries=128, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0     # Not in memory; may still come from the compiled bundle or the disk cache
+        self.resamples = 0  # Real rescales, counted by whoever fills a miss by resampling
+
+    def get(self, key):
+        pixmap = self._entries.get(key)
+        if pixmap is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return pixmap
+
+    def put(self, key, pixmap):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old.width() * old.height() * 4
+        self._entries[key] = pixmap
+        self.bytes += pixmap.width() * pixmap.height() * 4
+        # The newest entry always stays, even if it alone is over the budget
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= evicted.width() * evicted.height() * 4
+
+    def invalidate(self, namespace=None, glyph=None):
+        """Drop entries for one glyph, one asset namespace, or everything."""
+        if namespace is None and glyph is None:
+            self._entries.clear()
+            self.bytes = 0
+            return
+        for key in list(self._entries):
+            if namespace is not None and key[0] != namespace:
+                continue
+            if glyph is not None and key[1] != glyph:
+                continue
+            pixmap = self._entries.pop(key)
+            self.bytes -= pixmap.width() * pixmap.height() * 4
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class MipPyramid:
+    """A source pixmap plus successively halved copies, each made from the previous level on first use.
+
+    Downscales start from the smallest level still at least as large as the
+    target instead of the full original: less work, and no aliasing from
+    skipping source pixels on small windows.
+    """
+    MIN_SIZE = 8
+
+    def __init__(self, source):
+        self.levels = [source]
+
+    def level_for(self, w, h):
+        i = 0
+        level = self.levels[0]
+        while True:
+            nw, nh = level.width() // 2, level.height() // 2
+            if nw < max(w, self.MIN_SIZE) or nh < max(h, self.MIN_SIZE):
+                return level
+            i += 1
+            if i == len(self.levels):
+                self.levels.append(level.scaled(nw, nh, Qt.IgnoreAspectRatio, Qt.SmoothTransformation))
+            level = self.levels[i]
+
+    @property
+    def extra_bytes(self):
+        """Memory of the halved levels (the source itself is not counted)."""
+        return sum(p.width() * p.height() * 4 for p in self.levels[1:])
+
+
+# Shared by every AssetLoader/DraggableLabel in the process
+SCALED_CACHE = ScaledPixmapCache()
+
+DIGIT_GLYPHS = [str(i) for i in range(10)]
+GLYPH_FILES = {**{g: f"{g}.png" for g in DIGIT_GLYPHS}, "colon": "colon.png", "bg": "bg.png"}
+
+
+class LazyPixmaps:
+    """Read-only glyph -> QPixmap mapping that decodes each PNG on first access."""
+
+    def __init__(self, loader, names):
+        self._loader = loader
+        self._names = names
+
+    def __contains__(self, glyph):
+        return glyph in self._names
+
+    def __bool__(self):
+        return bool(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __getitem__(self, glyph):
+        if glyph not in self._names:
+            raise KeyError(glyph)
+        return self._loader.source(glyph)
+
+    def get(self, glyph, default=None):
+        return self._loader.source(glyph) if glyph in self._names else default
+
+
 class AssetLoader:
-    def __init__(self, asset_dir="assets"):
-        self.digits = {}
-        self.colon = None
-        self.bg = None
+    """Finds the asset files; full-size images are decoded lazily.
+
+    Startup only stats the files. Scaled glyphs for the current layout come
+    from the in-memory cache, then the compiled bundle (asset_pipeline.py),
+    then the on-disk cache of the last session, and only then from decoding
+    the original PNG and resampling its nearest mip level.
+    """
+
+    def __init__(self, asset_dir="assets", disk_cache=True, cache_dir=None, bundle=True):
         self.icon = None
+        self.scaled_cache = SCALED_CACHE
+        self.paths = {}       # glyph -> file path, for files that exist
+        self.sources = {}     # glyph -> (path, mtime_ns, size), the disk cache identity
+        self._decoded = {}    # glyph -> full-size QPixmap, filled on demand
+        self._mips = {}       # glyph -> MipPyramid, filled on the first resample
+        self.decode_count = 0
+        self.digits = LazyPixmaps(self, [])
+        self.watcher = None
         
         # Resolve asset_dir
         self.asset_dir = resource_path(asset_dir)
         print(f"Loading assets from: {self.asset_dir}")
         
+        self.disk_cache = None
+        if disk_cache:
+            from asset_cache import DiskGlyphCache
+            self.disk_cache = DiskGlyphCache(cache_dir)
+        self.bundle = None
+        if bundle:
+            from asset_cache import AssetBundle
+            self.bundle = AssetBundle(self.asset_dir) or None
+        
         try:
             self.load_assets()
         except Exception as e:
@@ -23,21 +169,14 @@ class AssetLoader:
             print(f"Asset directory not found: {self.asset_dir}")
             return
 
-        # Load Digits
-        for i in range(10):
-            path = os.path.join(self.asset_dir, f"{i}.png")
+        # Digits, colon and background: record the files, decode later
+        for glyph, filename in GLYPH_FILES.items():
+            path = os.path.join(self.asset_dir, filename)
             if os.path.exists(path):
-                self.digits[str(i)] = QPixmap(path)
-                
-        # Load Colon
-        colon_path = os.path.join(self.asset_dir, "colon.png")
-        if os.path.exists(colon_path):
-            self.colon = QPixmap(colon_path)
-            
-        # Load Background
-        bg_path = os.path.join(self.asset_dir, "bg.png")
-        if os.path.exists(bg_path):
-            self.bg = QPixmap(bg_path)
+                st = os.stat(path)
+                self.paths[glyph] = path
+                self.sources[glyph] = (path, st.st_mtime_ns, st.st_size)
+        self.digits = LazyPixmaps(self, [g for g in DIGIT_GLYPHS if g in self.paths])
             
         # Load Icon (Support .ico or .png)
         icon_path_ico = os.path.join(self.asset_dir, "icon.ico")
@@ -46,3 +185,110 @@ class AssetLoader:
              self.icon = QPixmap(icon_path_ico)
         elif os.path.exists(icon_path_png):
              self.icon = QPixmap(icon_path_png)
+
+    def watch(self):
+        """Start hot-reloading edited files in asset_dir; returns the AssetWatcher."""
+        if self.watcher is None:
+            from asset_watcher import AssetWatcher
+            self.watcher = AssetWatcher(self)
+        return self.watcher
+
+    def replace_source(self, glyph, source_id, image):
+        """Swap in a reloaded file (image decoded elsewhere; None if the file is gone).
+
+        Only this glyph's scaled entries are dropped; the disk cache needs no
+        invalidation because its keys include mtime and size.
+        """
+        self._decoded.pop(glyph, None)
+        self._mips.pop(glyph, None)
+        if source_id is None or image is None or image.isNull():
+            self.paths.pop(glyph, None)
+            self.sources.pop(glyph, None)
+        else:
+            self.paths[glyph] = source_id[0]
+            self.sources[glyph] = source_id
+            self._decoded[glyph] = QPixmap.fromImage(image)
+            self.decode_count += 1
+        self.digits = LazyPixmaps(self, [g for g in DIGIT_GLYPHS if g in self.paths])
+        self.scaled_cache.invalidate(self.asset_dir, glyph)
+
+    @property
+    def colon(self):
+        return self.source("colon")
+
+    @property
+    def bg(self):
+        return self.source("bg")
+
+    def has(self, glyph):
+        """Whether an asset file exists for the glyph (never decodes)."""
+        return glyph in self.paths
+
+    def source(self, glyph):
+        """Full-size pixmap for a glyph name ('0'-'9', 'colon', 'bg'), decoded on first use."""
+        pixmap = self._decoded.get(glyph)
+        if pixmap is None:
+            path = self.paths.get(glyph)
+            if path is None:
+                return None
+            if self.bundle is not None:
+                pixmap = self.bundle.load(glyph, self.sources.get(glyph))
+            if pixmap is None:
+                pixmap = QPixmap(path)
+                self.decode_count += 1
+            self._decoded[glyph] = pixmap
+        return pixmap
+
+    def mip(self, glyph):
+        """MipPyramid over the glyph's full-size pixmap (None if there is no usable file)."""
+        pyramid = self._mips.get(glyph)
+        if pyramid is None:
+            src = self.source(glyph)
+            if src is None or src.isNull():
+                return None
+            pyramid = self._mips[glyph] = MipPyramid(src)
+        return pyramid
+
+    def memory_usage(self):
+        """Bytes held by decoded full-size sources, their mip levels and the (shared) scaled cache."""
+        return {
+            "source_bytes": sum(p.width() * p.height() * 4 for p in self._decoded.values()),
+            "mip_bytes": sum(m.extra_bytes for m in self._mips.values()),
+            "scaled_cache_bytes": self.scaled_cache.bytes,
+        }
+
+    def scaled(self, glyph, size, dpr=1.0, smooth=True):
+        """Return the glyph scaled to size (logical pixels), resampling only on a cache miss.
+
+        smooth=False is the interactive-drag path: a cached high-quality copy
+        is reused if there is one, otherwise a cheap nearest-neighbour scale
+        is returned without being cached (every drag step has a new size).
+        """
+        w, h = size.width(), size.height()
+        if w <= 1 or h <= 1:
+            return None
+        key = (self.asset_dir, glyph, w, h, dpr)
+        pixmap = self.scaled_cache.get(key)
+        if pixmap is None:
+            target = QSize(round(w * dpr), round(h * dpr))
+            source_id = self.sources.get(glyph)
+            if smooth and self.bundle is not None:
+                pixmap = self.bundle.load(glyph, source_id, target.width(), target.height())
+            if pixmap is None and smooth and self.disk_cache is not None and source_id is not None:
+                pixmap = self.disk_cache.load(source_id, target.width(), target.height())
+            if pixmap is None:
+                pyramid = self.mip(glyph)
+                if pyramid is None:
+                    return None
+                self.scaled_cache.resamples += 1
+                pixmap = pyramid.level_for(target.width(), target.height()).scaled(
+                    target,
+                    Qt.IgnoreAspectRatio,
+                    Qt.SmoothTransformation if smooth else Qt.FastTransformation
+                )
+                if smooth and self.disk_cache is not None and source_id is not None:
+                    self.disk_cache.store(source_id, pixmap)
+            pixmap.setDevicePixelRatio(dpr)
+            if smooth:
+                self.scaled_cache.put(key, pixmap)
+        return pixmap
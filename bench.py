@@ -0,0 +1,608 @@
+"""Micro-benchmarks for the countdown hot paths.
+
+Usage:
+    python bench.py                          # run every benchmark
+    python bench.py time_str paint           # run selected benchmarks by name
+    python bench.py --json results.json      # also save the results
+    python bench.py --baseline results.json  # exit 1 on regressions over --threshold
+
+Qt benchmarks run on the offscreen platform, no display needed. Window
+benchmarks use a scratch layout_config.json, never the real one.
+"""
+import os
+import sys
+import time
+
+_app = None
+_scratch_dir = None
+
+LABEL_SIZES = [(60, 90), (120, 180), (240, 360)]
+DEFAULT_THRESHOLD = 0.2
+
+
+def _qt_app():
+    global _app
+    if _app is None:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt5.QtWidgets import QApplication
+        _app = QApplication.instance() or QApplication([sys.argv[0]])
+    return _app
+
+
+def _per_call_us(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def _scratch_config(**overrides):
+    """Point ConfigManager at a throwaway config file holding the given settings."""
+    global _scratch_dir
+    import atexit
+    import json
+    import shutil
+    import tempfile
+    from core_utils import ConfigManager
+
+    if _scratch_dir is None:
+        _scratch_dir = tempfile.mkdtemp()
+        atexit.register(shutil.rmtree, _scratch_dir, True)
+    path = os.path.join(_scratch_dir, "layout_config.json")
+    config = {"window_size": [600, 240], "target_date": "2026-01-01 00:00:00", "top_most": False,
+              "watch_assets": False, **overrides}
+    # Switch first: that flushes saves still pending from the previous window onto the old contents
+    ConfigManager.use_config_file(path)
+    with open(path, "w") as f:
+        json.dump(config, f)
+
+
+def _text_loader():
+    """AssetLoader over an empty directory: the text-fallback mode."""
+    import tempfile
+    from assets import AssetLoader
+    return AssetLoader(tempfile.mkdtemp(dir=_scratch_dir), disk_cache=False)
+
+
+def _window(loader=None, **config):
+    _qt_app()
+    _scratch_config(**config)
+    from main import CountdownWindow
+
+    window = CountdownWindow(loader=loader)
+    window.show()
+    _app.processEvents()
+    window.ticker.stop()  # Benchmarks drive update_display themselves
+    return window
+
+
+def _close(window):
+    window.close()
+    window.deleteLater()
+    _app.processEvents()
+
+
+def bench_time_str(iterations=20000):
+    """Per-tick cost of the uncached get_time_str path versus a CompiledTarget."""
+    from core_utils import TimeCalculator, get_timezone
+
+    tz = get_timezone("Asia/Shanghai")
+    target = "2026-01-01 00:00:00"
+    compiled = TimeCalculator.compile_target(target, tz)
+
+    results = {
+        "get_time_str_us": _per_call_us(lambda: TimeCalculator.get_time_str(target, tz), iterations),
+        "compiled_time_str_us": _per_call_us(compiled.time_str, iterations),
+    }
+
+    now = time.time()
+    timestamps = [now + i for i in range(iterations)]
+    start = time.perf_counter()
+    TimeCalculator.time_strs(target, tz, timestamps)
+    results["time_strs_batch_us"] = (time.perf_counter() - start) / iterations * 1e6
+    return results
+
+
+def bench_timeline(seconds=86400):
+    """Every second of a day around the target: scalar loops versus the NumPy timeline (ms).
+
+    mismatches counts samples where the timeline differs from values(); it must be 0.
+    """
+    import numpy as np
+    from core_utils import TimeCalculator, get_timezone
+
+    tz = get_timezone("Asia/Shanghai")
+    target = "2026-01-01 00:00:00"
+    compiled = TimeCalculator.compile_target(target, tz)
+    # Fractional offsets exercise the truncation at every boundary
+    timestamps = compiled.epoch + np.arange(-seconds // 2, seconds // 2) + 0.37
+    listed = timestamps.tolist()
+
+    start = time.perf_counter()
+    for ts in listed[:2000]:
+        TimeCalculator.get_time_str(target, tz)
+    uncached_ms = (time.perf_counter() - start) / 2000 * seconds * 1000
+
+    start = time.perf_counter()
+    scalar = [compiled.values(ts) for ts in listed]
+    compiled_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    timeline = compiled.timeline(timestamps)
+    timeline_ms = (time.perf_counter() - start) * 1000
+
+    expected = np.array(scalar)
+    mismatches = int(np.count_nonzero((expected[:, 0] != timeline.val1) | (expected[:, 1] != timeline.val2)))
+    return {
+        "get_time_str_loop_ms": uncached_ms,
+        "compiled_loop_ms": compiled_ms,
+        "timeline_ms": timeline_ms,
+        "speedup_vs_compiled": compiled_ms / timeline_ms,
+        "speedup_vs_get_time_str": uncached_ms / timeline_ms,
+        "mode_switches": len(timeline.switches()),
+        "mismatches": mismatches,
+    }
+
+
+def bench_headless(frames=200):
+    """Headless FrameRenderer throughput (frames per second) at common output sizes."""
+    _qt_app()
+    from PyQt5.QtCore import QSize
+    from assets import AssetLoader
+    from rendering import FrameRenderer
+
+    loader = AssetLoader()
+    results = {}
+    for w, h in [(600, 240), (1280, 512), (1920, 768)]:
+        renderer = FrameRenderer(loader, QSize(w, h))
+        renderer.render("00", "00")  # Warm the static layer and atlas
+        start = time.perf_counter()
+        for i in range(frames):
+            renderer.render(f"{i // 60 % 100:02d}", f"{i % 60:02d}")
+        results[f"fps_{w}x{h}"] = frames / (time.perf_counter() - start)
+    return results
+
+
+def bench_export(seconds=600, fps=30, size=(1280, 512)):
+    """Offline export throughput in unique displays per second, one worker versus one per core."""
+    from core_utils import TimeCalculator, get_timezone
+    from export import display_runs, export
+
+    compiled = TimeCalculator.compile_target("2026-01-01 00:00:00", get_timezone("Asia/Shanghai"))
+    runs = display_runs(compiled, -seconds, 0, fps)
+    results = {"unique_displays": len(runs), "frames": sum(run[1] for run in runs)}
+    for workers in sorted({1, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        export(runs, size, os.devnull, "raw", workers)  # Rendering only, no disk
+        results[f"fps_{workers}_workers"] = len(runs) / (time.perf_counter() - start)
+    return results
+
+
+def bench_shm_latency(frames=200, interval=0.005):
+    """Producer-to-consumer delay through the shared-memory frame output (ms)."""
+    _qt_app()
+    import multiprocessing
+    import tempfile
+    from PyQt5.QtGui import QImage
+    from shm_frames import SharedFrameWriter, latency_consumer
+
+    path = os.path.join(tempfile.mkdtemp(), "frames.shm")
+    image = QImage(600, 240, QImage.Format_ARGB32_Premultiplied)
+    image.fill(0)
+    writer = SharedFrameWriter(path, image.width(), image.height())
+    ready = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    consumer = multiprocessing.Process(target=latency_consumer, args=(path, frames, ready, results))
+    consumer.start()
+    ready.wait()
+    write_times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        writer.write(image)
+        write_times.append(time.perf_counter() - start)
+        time.sleep(interval)
+    latencies = sorted(results.get())
+    consumer.join()
+    writer.close()
+    os.remove(path)
+    if not latencies:
+        return {"frames_received": 0}
+    return {
+        "frames_received": len(latencies),
+        "write_ms": sum(write_times) / len(write_times) * 1000,
+        "latency_p50_ms": latencies[len(latencies) // 2] * 1000,
+        "latency_p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+        "latency_max_ms": latencies[-1] * 1000,
+    }
+
+
+def bench_asset_startup(window_size=(600, 240)):
+    """Time to get every glyph the default layout needs, cold versus from the disk cache (ms)."""
+    _qt_app()
+    import shutil
+    import tempfile
+    from PyQt5.QtCore import QSize
+    from assets import AssetLoader, SCALED_CACHE
+    from layout_helper import LayoutHelper
+
+    w, h = window_size
+    rects = LayoutHelper.compute_slot_rects(w, h)
+    cache_dir = tempfile.mkdtemp()
+
+    def startup():
+        SCALED_CACHE.invalidate()
+        start = time.perf_counter()
+        loader = AssetLoader(cache_dir=cache_dir, bundle=False)
+        for glyph in [str(i) for i in range(10)]:
+            loader.scaled(glyph, rects[0].size())
+        loader.scaled("colon", rects[2].size())
+        loader.scaled("bg", QSize(w, h))
+        elapsed = (time.perf_counter() - start) * 1000
+        loader.disk_cache.flush()  # Stores are written in the background; the next run must find them
+        return elapsed, loader.decode_count
+
+    try:
+        cold_ms, cold_decodes = startup()
+        warm_ms, warm_decodes = startup()
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return {
+        "cold_ms": cold_ms,
+        "cold_png_decodes": cold_decodes,
+        "cached_ms": warm_ms,
+        "cached_png_decodes": warm_decodes,
+    }
+
+
+def bench_startup(runs=3):
+    """Time to first painted frame of a fresh main.py process (ms), via --startup-budget."""
+    import shutil
+    import subprocess
+    import tempfile
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    workdir = tempfile.mkdtemp()  # Startup saves layout_config.json in the working directory
+    times = []
+    try:
+        for _ in range(runs):
+            # A budget run exits after the first frame; the budget itself is just the timeout
+            proc = subprocess.run([sys.executable, os.path.join(here, "main.py"), "--startup-budget", "60000"],
+                                  cwd=workdir, env=env, capture_output=True, text=True, timeout=60)
+            for line in proc.stdout.splitlines():
+                if line.strip().startswith("first frame"):
+                    times.append(float(line.split()[2]))
+            if proc.returncode != 0:
+                raise RuntimeError(f"startup failed (exit {proc.returncode}):\n{proc.stdout}{proc.stderr}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    times.sort()
+    return {"first_frame_ms": times[len(times) // 2], "first_frame_min_ms": times[0]}
+
+
+def bench_update_display(iterations=2000):
+    """One tick of CountdownWindow.update_display (us), when every slot changes and when none does."""
+    _qt_app()
+    _scratch_config()
+    results = {}
+    for mode, loader, config in [("pixmap", None, {}), ("atlas", None, {"render_mode": "atlas"}),
+                                 ("text", _text_loader(), {})]:
+        window = _window(loader, **config)
+
+        def changed():
+            window.rendered_glyphs = [None] * 5
+            window.update_display()
+
+        results[f"{mode}_changed_us"] = _per_call_us(changed, iterations)
+        results[f"{mode}_unchanged_us"] = _per_call_us(window.update_display, iterations)
+        _close(window)
+    return results
+
+
+def bench_reset_layout(iterations=200):
+    """LayoutHelper.reset_layout on a live window (us), including its config save."""
+    from layout_helper import LayoutHelper
+
+    window = _window()
+    result = {"reset_layout_us": _per_call_us(lambda: LayoutHelper.reset_layout(window), iterations)}
+    _close(window)
+    return result
+
+
+def bench_label_scaling(iterations=200):
+    """DraggableLabel.update_scaled_pixmap per label size (us): a fresh resample versus the shared cache, and mip memory."""
+    _qt_app()
+    from assets import AssetLoader, SCALED_CACHE
+    from widgets import DraggableLabel
+
+    loader = AssetLoader(disk_cache=False, bundle=False)
+    results = {}
+    for w, h in LABEL_SIZES:
+        label = DraggableLabel()
+        label.resize(w, h)
+        label.set_glyph(loader, "8")
+
+        def cold():
+            SCALED_CACHE.invalidate(loader.asset_dir, "8")
+            label.update_scaled_pixmap()
+
+        results[f"cold_{w}x{h}_us"] = _per_call_us(cold, iterations)
+        results[f"cached_{w}x{h}_us"] = _per_call_us(label.update_scaled_pixmap, iterations)
+        label.deleteLater()
+    memory = loader.memory_usage()
+    results["source_kb"] = memory["source_bytes"] / 1024
+    results["mip_kb"] = memory["mip_bytes"] / 1024
+    return results
+
+
+def bench_resize(steps=200):
+    """Edit-mode window resize from the bottom-right handle: the handler alone, and a full step with repaint."""
+    _qt_app()
+    from PyQt5.QtCore import QEvent, QPoint, Qt
+    from PyQt5.QtGui import QMouseEvent
+    from resize_handler import ResizeHandler
+
+    window = _window()
+    window.toggle_edit_mode()
+    handle = QPoint(window.width() - 5, window.height() - 5)
+    start = window.mapToGlobal(handle)
+    _app.sendEvent(window, QMouseEvent(QEvent.MouseButtonPress, handle, start,
+                                       Qt.LeftButton, Qt.LeftButton, Qt.NoModifier))
+    handler_s = 0.0
+    step_s = 0.0
+    for i in range(steps):
+        pos = start + QPoint(i % 100, i % 50)
+        t0 = time.perf_counter()
+        ResizeHandler.handle_global_resize(window, pos, Qt.NoModifier)
+        t1 = time.perf_counter()
+        _app.processEvents()
+        handler_s += t1 - t0
+        step_s += time.perf_counter() - t0
+    _app.sendEvent(window, QMouseEvent(QEvent.MouseButtonRelease, handle, start,
+                                       Qt.LeftButton, Qt.NoButton, Qt.NoModifier))
+    _close(window)
+    return {"handle_global_resize_us": handler_s / steps * 1e6, "resize_step_ms": step_s / steps * 1000}
+
+
+def bench_edit_drag(rate=500, seconds=1.0):
+    """Edit-mode resize driven by `rate` synthetic mouse moves per second, through the FrameCoalescer.
+
+    Reports how many layout passes per second actually ran (capped near
+    1000 / FrameCoalescer.FRAME_MS) and what each pass cost.
+    """
+    _qt_app()
+    from PyQt5.QtCore import QEvent, QPoint, Qt
+    from PyQt5.QtGui import QMouseEvent
+
+    window = _window()
+    window.toggle_edit_mode()
+    coalescer = window.coalescer
+    handle = QPoint(window.width() - 5, window.height() - 5)
+    start = window.mapToGlobal(handle)
+    _app.sendEvent(window, QMouseEvent(QEvent.MouseButtonPress, handle, start,
+                                       Qt.LeftButton, Qt.LeftButton, Qt.NoModifier))
+    apply = coalescer.apply
+    pass_s = []
+
+    def timed_apply(state):
+        t0 = time.perf_counter()
+        apply(state)
+        pass_s.append(time.perf_counter() - t0)
+
+    coalescer.apply = timed_apply
+    posted, passes = coalescer.posted, coalescer.passes
+    began = time.perf_counter()
+    moves = int(rate * seconds)
+    for i in range(moves):
+        # Pace the moves in real time; the coalescer's frame timer fires in between
+        while time.perf_counter() < began + i / rate:
+            _app.processEvents()
+        offset = QPoint(i % 100, i % 50)
+        _app.sendEvent(window, QMouseEvent(QEvent.MouseMove, handle + offset, start + offset,
+                                           Qt.NoButton, Qt.LeftButton, Qt.NoModifier))
+    live_rate = coalescer.passes_per_second
+    elapsed = time.perf_counter() - began
+    _app.sendEvent(window, QMouseEvent(QEvent.MouseButtonRelease, handle, start,
+                                       Qt.LeftButton, Qt.NoButton, Qt.NoModifier))
+    coalescer.apply = apply
+    _close(window)
+    return {
+        "moves_per_second": (coalescer.posted - posted) / elapsed,
+        "passes_per_second": (coalescer.passes - passes) / elapsed,
+        "live_passes_per_second": live_rate,
+        "pass_ms": sum(pass_s) / max(1, len(pass_s)) * 1000,
+    }
+
+
+def bench_paint(iterations=100):
+    """A full window paint, children included (ms), per render mode."""
+    _qt_app()
+    from PyQt5.QtGui import QImage
+
+    _scratch_config()
+    results = {}
+    for mode, loader, config in [("pixmap", None, {}), ("atlas", None, {"render_mode": "atlas"}),
+                                 ("text", _text_loader(), {})]:
+        window = _window(loader, **config)
+        image = QImage(window.size(), QImage.Format_ARGB32_Premultiplied)
+
+        def paint():
+            image.fill(0)
+            window.render(image)
+
+        paint()  # Build the static layer and atlas outside the timing
+        results[f"{mode}_ms"] = _per_call_us(paint, iterations) / 1000
+        _close(window)
+    return results
+
+
+def bench_screen_switch(switches=100):
+    """Moving between two screens, at the app's pixel ratio and twice it (vary with QT_SCALE_FACTOR).
+
+    The first visit to the second screen renders its caches; after that a
+    switch should only swap them, with no resamples. Then three windows on
+    three different ratios tick side by side, also with no resamples.
+    """
+    app = _qt_app()
+    from PyQt5.QtCore import QSize
+    from assets import AssetLoader
+    from layout_helper import LayoutHelper
+    from rendering import GlyphAtlas, StaticLayer
+
+    loader = AssetLoader(disk_cache=False, bundle=False)
+    size = QSize(600, 240)
+    rects = LayoutHelper.compute_slot_rects(size.width(), size.height())
+    layer = StaticLayer(loader)
+    atlas = GlyphAtlas(loader)
+    dprs = [app.devicePixelRatio(), app.devicePixelRatio() * 2]
+
+    def show_on(dpr):
+        layer.get(size, rects[2], dpr)
+        atlas.ensure([r.size() for r in rects], dpr)
+        for glyph in loader.digits:
+            loader.scaled(glyph, rects[0].size(), dpr)  # What the digit labels ask for
+
+    show_on(dprs[0])
+    start = time.perf_counter()
+    show_on(dprs[1])
+    first_ms = (time.perf_counter() - start) * 1000
+    resamples = loader.scaled_cache.resamples
+    switch_us = _per_call_us(lambda: (show_on(dprs[0]), show_on(dprs[1])), switches // 2) / 2
+    rescales = loader.scaled_cache.resamples - resamples
+
+    # Three windows at once, each on a screen with its own ratio, sharing the loader's cache
+    screens = [(dpr, StaticLayer(loader), GlyphAtlas(loader)) for dpr in (dprs[0], dprs[0] * 1.5, dprs[1])]
+
+    def tick():
+        for dpr, screen_layer, screen_atlas in screens:
+            screen_layer.get(size, rects[2], dpr)
+            screen_atlas.ensure([r.size() for r in rects], dpr)
+            for glyph in loader.digits:
+                loader.scaled(glyph, rects[0].size(), dpr)
+
+    tick()
+    resamples = loader.scaled_cache.resamples
+    for _ in range(10):
+        tick()
+    return {
+        "dpr": dprs[0],
+        "first_visit_ms": first_ms,
+        "switch_us": switch_us,
+        "rescales_after_warm": rescales,
+        "rescales_three_screens": loader.scaled_cache.resamples - resamples,
+    }
+
+
+def bench_multi_window(count=4):
+    """Cost of each extra countdown window sharing the loader, glyph caches and tick timer (ms)."""
+    _qt_app()
+    from assets import SCALED_CACHE
+    from core_utils import ConfigManager
+    from main import CountdownWindow
+    from tick_scheduler import TickSource
+
+    zones = ["Asia/Shanghai", "Asia/Tokyo", "Europe/London", "America/New_York", "UTC"]
+    _scratch_config(windows=[{"timezone": zones[i % len(zones)]} for i in range(count)])
+    SCALED_CACHE.invalidate()
+    config = ConfigManager.load_config()
+    source = TickSource()
+    windows = []
+    times = []
+    for section in ConfigManager.window_configs(config):
+        start = time.perf_counter()
+        window = CountdownWindow(None, windows[0].loader if windows else None, section, config, source)
+        window.show()
+        _app.processEvents()
+        times.append((time.perf_counter() - start) * 1000)
+        windows.append(window)
+    results = {
+        "first_window_ms": times[0],
+        "extra_window_ms": sum(times[1:]) / max(1, len(times) - 1),
+        "png_decodes": windows[0].loader.decode_count,
+        "scaled_cache_entries": len(SCALED_CACHE),
+    }
+    for window in windows:
+        _close(window)
+    return results
+
+
+BENCHMARKS = {
+    "time_str": bench_time_str,
+    "timeline": bench_timeline,
+    "headless": bench_headless,
+    "export": bench_export,
+    "shm_latency": bench_shm_latency,
+    "asset_startup": bench_asset_startup,
+    "startup": bench_startup,
+    "update_display": bench_update_display,
+    "reset_layout": bench_reset_layout,
+    "label_scaling": bench_label_scaling,
+    "resize": bench_resize,
+    "edit_drag": bench_edit_drag,
+    "paint": bench_paint,
+    "screen_switch": bench_screen_switch,
+    "multi_window": bench_multi_window,
+}
+
+
+def find_regressions(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Metrics more than `threshold` (a fraction) worse than the baseline.
+
+    Times (*_us, *_ms) regress upwards and frame rates (fps_*) downwards;
+    counts are not compared.
+    """
+    regressions = []
+    for name, metrics in results.items():
+        for key, value in metrics.items():
+            old = baseline.get(name, {}).get(key)
+            if not old or not value:
+                continue
+            if key.endswith(("_us", "_ms")):
+                change = value / old - 1
+            elif key.startswith("fps_"):
+                change = old / value - 1
+            else:
+                continue
+            if change > threshold:
+                regressions.append((f"{name}.{key}", old, value, change))
+    return regressions
+
+
+def main(argv):
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="mmticktock benchmarks")
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--json", metavar="PATH", help="write the results as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a saved --json file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown versus the baseline, as a fraction (default %(default)s)")
+    args = parser.parse_args(argv)
+
+    names = args.names or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name} (choose from {', '.join(BENCHMARKS)})")
+            return 2
+    results = {}
+    for name in names:
+        results[name] = BENCHMARKS[name]()
+        for key, value in results[name].items():
+            print(f"{name}.{key}: {value:.2f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(results, json.load(f), args.threshold)
+        for metric, old, new, change in regressions:
+            print(f"REGRESSION {metric}: {old:.2f} -> {new:.2f} (+{change:.0%})")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -3,10 +3,12 @@ import json
 import shutil
 import subprocess
 import sys
-from PIL import Image
+import importlib.util
 
-def generate_ico():
-    print("Generating icon...")
+import asset_pipeline
+
+def compile_assets(window_size):
+    print("Compiling assets...")
     png_path = os.path.join("assets", "icon.png")
     ico_path = os.path.join("assets", "icon.ico")
     
@@ -16,17 +18,11 @@ def generate_ico():
         print(f"Renaming {weird_path} to {png_path}")
         os.rename(weird_path, png_path)
 
-    if os.path.exists(png_path):
-        try:
-            img = Image.open(png_path)
-            img.save(ico_path, format='ICO', sizes=[(256, 256)])
-            print(f"Generated {ico_path} from {png_path}")
-        except Exception as e:
-            print(f"Failed to generate ICO: {e}")
-    else:
-        print(f"{png_path} not found! Checking for existing icon.ico...")
-        if not os.path.exists(ico_path):
-            print("Warning: No icon found.")
+    if not os.path.exists(png_path) and not os.path.exists(ico_path):
+        print("Warning: No icon found.")
+    
+    # Icon plus the pre-scaled glyph bundle; only inputs whose content changed are redone, in parallel
+    asset_pipeline.build("assets", window_size)
 
 def generate_config():
     print("Checking configuration...")
@@ -45,14 +41,30 @@ def generate_config():
     else:
         print(f"{config_path} already exists.")
 
-def clean_build_dirs():
-    print("Cleaning up...")
-    for d in ['build', 'dist']:
-        if os.path.exists(d):
-            shutil.rmtree(d)
-    for f in os.listdir('.'):
-        if f.endswith('.spec'):
-            os.remove(f)
+def sync_tree(src, dst):
+    """Copy new or changed files from src to dst and delete files src no longer has."""
+    copied = 0
+    wanted = set()
+    for root, dirs, files in os.walk(src):
+        rel = os.path.relpath(root, src)
+        os.makedirs(os.path.join(dst, rel), exist_ok=True)
+        for name in files:
+            s = os.path.join(root, name)
+            d = os.path.join(dst, rel, name)
+            wanted.add(os.path.normpath(d))
+            st = os.stat(s)
+            if os.path.exists(d):
+                dt = os.stat(d)
+                if dt.st_size == st.st_size and int(dt.st_mtime) == int(st.st_mtime):
+                    continue
+            shutil.copy2(s, d)
+            copied += 1
+    for root, dirs, files in os.walk(dst):
+        for name in files:
+            d = os.path.normpath(os.path.join(root, name))
+            if d not in wanted:
+                os.remove(d)
+    print(f"Synced {src} -> {dst}: {copied} files copied")
 
 def build_exe():
     print("Building EXE...")
@@ -61,7 +73,10 @@ def build_exe():
         '--noconsole',
         '--onefile',
         '--name', 'mmticktock',
-        '--add-data', 'assets;assets',
+        # Only the source images go into the EXE; the compiled bundle ships next to it in dist/assets
+        '--add-data', 'assets/*.png;assets',
+        '--add-data', 'assets/*.ico;assets',
+        '--noconfirm',
         'main.py'
     ]
     
@@ -69,6 +84,10 @@ def build_exe():
         cmd.insert(5, '--icon')
         cmd.insert(6, os.path.join("assets", "icon.ico"))
     
+    # zoneinfo needs the tz database from the tzdata package on Windows; without it the app falls back to pytz
+    if importlib.util.find_spec("tzdata") is not None:
+        cmd[-1:-1] = ['--collect-data', 'tzdata']
+    
     result = subprocess.run(cmd, shell=True)
     if result.returncode != 0:
         print("Build failed!")
@@ -93,12 +112,10 @@ def copy_files():
         with open(os.path.join(dist_dir, "layout_config.json"), "w", encoding="utf-8") as f:
             json.dump(default_config, f, indent=4)
     
-    # Copy assets
+    # Copy assets (only what changed since the last build)
     dest_assets = os.path.join(dist_dir, "assets")
     if os.path.exists("assets"):
-        if os.path.exists(dest_assets):
-            shutil.rmtree(dest_assets)
-        shutil.copytree("assets", dest_assets)
+        sync_tree("assets", dest_assets)
         
     # Copy tutorial
     doc_name = "mmticktock教程.docx"
@@ -108,9 +125,11 @@ def copy_files():
         print(f"Warning: {doc_name} not found.")
 
 if __name__ == "__main__":
-    generate_ico()
     generate_config()
-    clean_build_dirs()
+    with open("layout_config.json", encoding="utf-8") as f:
+        window_size = json.load(f).get("window_size", [600, 240])
+    compile_assets(window_size)
+    # PyInstaller reuses its work in build/ between runs; dist/ is updated in place
     build_exe()
     copy_files()
     print("Build complete! Check the dist folder.")
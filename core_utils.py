@@ -1,17 +1,156 @@
 import os
 import json
+import atexit
 import datetime
-import pytz
+import threading
+import time
+from collections import ChainMap, namedtuple
+
+# Resolved once, so a later change of working directory cannot move the config
+CONFIG_FILE = os.path.abspath("layout_config.json")
+DEFAULT_TIMEZONE = "Asia/Shanghai"
+
+
+def get_timezone(name):
+    """tzinfo for an IANA name: stdlib zoneinfo, or pytz where there is no tz database."""
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(name)
+    except (ImportError, KeyError, ValueError):
+        # Windows without the tzdata package raises ZoneInfoNotFoundError (a KeyError); malformed keys raise ValueError
+        import pytz
+        return pytz.timezone(name)
+
+
+def load_timezone(name):
+    """get_timezone for a hand-edited config value: an unknown or malformed name falls back to the default."""
+    try:
+        return get_timezone(name)
+    except Exception as e:
+        print(f"Unknown timezone {name!r} ({e!r}), using {DEFAULT_TIMEZONE}")
+        return get_timezone(DEFAULT_TIMEZONE)
+
+
+def localize(naive, tz):
+    """Attach tz to a naive datetime, for both pytz and zoneinfo timezones."""
+    if hasattr(tz, "localize"):
+        return tz.localize(naive)
+    return naive.replace(tzinfo=tz)
+
+class ConfigWriter:
+    """Saves the config on a worker thread.
+
+    save() only snapshots the dict; bursts of saves are coalesced into one
+    write after QUIET_SECONDS without changes, and saves that would not
+    change the file are dropped. Each write goes to a temp file that is then
+    renamed over the config, so a crash never leaves a truncated file.
+    flush() writes anything pending immediately and runs at interpreter exit.
+    """
+    QUIET_SECONDS = 0.5
+
+    def __init__(self, path=CONFIG_FILE, quiet=QUIET_SECONDS):
+        self.path = path
+        self.quiet = quiet
+        self.writes = 0
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._pending = None      # (seq, json text) waiting for the quiet period
+        self._busy = False        # The worker has taken a snapshot and not finished writing it
+        self._due = 0.0
+        self._seq = 0
+        self._written_seq = 0
+        self._last_data = None    # Most recent snapshot, written or pending
+        self._thread = None
+        atexit.register(self.flush)
+
+    def save(self, config):
+        data = json.dumps(config)
+        with self._cond:
+            if data == self._last_data:
+                return
+            self._last_data = data
+            self._seq += 1
+            self._pending = (self._seq, data)
+            self._due = time.monotonic() + self.quiet
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="config-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def flush(self):
+        """Write any pending change now, on the calling thread.
+
+        Also waits for a write the worker has already started, so nothing is
+        lost when the daemon thread is killed at exit.
+        """
+        with self._cond:
+            pending, self._pending = self._pending, None
+        if pending is not None:
+            self._write(*pending)
+        with self._cond:
+            while self._busy:
+                self._cond.wait()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                delay = self._due - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                pending, self._pending = self._pending, None
+                self._busy = True
+            try:
+                self._write(*pending)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _write(self, seq, data):
+        with self._io_lock:
+            if seq <= self._written_seq:
+                return  # flush() already wrote this or a newer snapshot
+            try:
+                with open(self.path, "r") as f:
+                    unchanged = f.read() == data
+            except OSError:
+                unchanged = False
+            if unchanged:
+                self._written_seq = seq
+                return
+            tmp = self.path + ".tmp"
+            try:
+                with open(tmp, "w") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+                self._written_seq = seq
+                self.writes += 1
+            except Exception as e:
+                print(f"Save config error: {e}")
 
-CONFIG_FILE = "layout_config.json"
 
 class ConfigManager:
+    config_file = CONFIG_FILE
+    writer = None
+
+    @staticmethod
+    def use_config_file(path):
+        """Load and save a different config file from now on (benchmarks use a scratch copy)."""
+        ConfigManager.flush()
+        ConfigManager.config_file = os.path.abspath(path)
+        ConfigManager.writer = None
+
     @staticmethod
     def load_config():
         config = {}
-        if os.path.exists(CONFIG_FILE):
+        if os.path.exists(ConfigManager.config_file):
             try:
-                with open(CONFIG_FILE, "r") as f:
+                with open(ConfigManager.config_file, "r") as f:
                     config = json.load(f)
             except Exception:
                 config = {}
@@ -26,37 +165,166 @@ class ConfigManager:
             
         return config
 
+    @staticmethod
+    def window_configs(config):
+        """One config mapping per countdown window.
+
+        A "windows" list holds one section per window (target_date, timezone,
+        window_size, window_pos, ...). A section falls back to the top level
+        for keys it lacks, and changes are stored in the section itself.
+        Without the list there is a single window using the top level.
+        """
+        sections = [s for s in config.get("windows") or [] if isinstance(s, dict)]
+        if not sections:
+            return [config]
+        return [ChainMap(section, config) for section in sections]
+
     @staticmethod
     def save_config(config_data):
-        try:
-            with open(CONFIG_FILE, "w") as f:
-                json.dump(config_data, f)
-        except Exception as e:
-            print(f"Save config error: {e}")
+        """Queue a save; the file is written in the background (see ConfigWriter)."""
+        if ConfigManager.writer is None:
+            ConfigManager.writer = ConfigWriter(ConfigManager.config_file)
+        ConfigManager.writer.save(config_data)
 
-class TimeCalculator:
     @staticmethod
-    def get_time_str(target_date_str, current_tz):
-        now = datetime.datetime.now(current_tz)
+    def flush():
+        if ConfigManager.writer is not None:
+            ConfigManager.writer.flush()
+
+class Timeline(namedtuple("Timeline", "timestamps val1 val2 hhmm clamped")):
+    """Display values for an array of timestamps, as NumPy arrays (see CompiledTarget.timeline).
+
+    hhmm is True where the display is in HH:MM mode, clamped where it
+    sticks at 99:99; val1/val2 match CompiledTarget.values element for element.
+    """
+    __slots__ = ()
+
+    def switches(self):
+        """Indices where the display mode (MM:SS, HH:MM or clamped) differs from the previous sample."""
+        import numpy as np
+        changed = (self.hhmm[1:] != self.hhmm[:-1]) | (self.clamped[1:] != self.clamped[:-1])
+        return np.flatnonzero(changed) + 1
+
+    def strings(self):
+        """(val1, val2) string arrays, formatted like CompiledTarget.time_str."""
+        import numpy as np
+        two_digits = np.array([f"{i:02d}" for i in range(100)])
+        return two_digits[self.val1], two_digits[self.val2]
+
+
+class CompiledTarget:
+    """A countdown target resolved once to a UTC epoch.
+
+    Per tick only a clock read and integer arithmetic remain; rebuild it when
+    the target date string or the timezone changes.
+    """
+    HHMM_THRESHOLD = 3600       # Above this many seconds show HH:MM, else MM:SS
+    HHMM_CLAMP = 100 * 3600     # HH:MM sticks at 99:99 from here
+    MMSS_CLAMP = 100 * 60       # MM:SS sticks at 99:99 from here
+
+    def __init__(self, target_date_str, current_tz):
+        self.target_date_str = target_date_str
+        self.tz = current_tz
         try:
             target_naive = datetime.datetime.strptime(target_date_str, "%Y-%m-%d %H:%M:%S")
         except ValueError:
             target_naive = datetime.datetime(2026, 1, 1, 0, 0, 0)
-        
-        target = current_tz.localize(target_naive)
-        
-        diff = target - now if now < target else now - target
-        total_seconds = int(diff.total_seconds())
-        
-        if total_seconds > 3600:
-            hours = total_seconds // 3600
-            minutes = (total_seconds % 3600) // 60
-            if hours > 99: hours, minutes = 99, 99
-            val1, val2 = hours, minutes
-        else:
-            minutes = total_seconds // 60
-            seconds = total_seconds % 60
-            if minutes > 99: minutes, seconds = 99, 99
-            val1, val2 = minutes, seconds
-            
+        self.epoch = localize(target_naive, current_tz).timestamp()
+
+    def matches(self, target_date_str, current_tz):
+        return self.target_date_str == target_date_str and self.tz is current_tz
+
+    def values(self, now=None):
+        """(val1, val2) as ints for a UNIX timestamp (defaults to the current time)."""
+        if now is None:
+            now = time.time()
+        total_seconds = int(abs(self.epoch - now))
+        if total_seconds > self.HHMM_THRESHOLD:
+            if total_seconds >= self.HHMM_CLAMP:
+                return 99, 99
+            return total_seconds // 3600, (total_seconds % 3600) // 60
+        if total_seconds >= self.MMSS_CLAMP:
+            return 99, 99
+        return total_seconds // 60, total_seconds % 60
+
+    def timeline(self, timestamps):
+        """Vectorized values() for a sequence of UNIX timestamps; needs NumPy."""
+        import numpy as np
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        # Same float64 subtraction and truncation as values(), so results match exactly
+        total = np.abs(self.epoch - timestamps).astype(np.int64)
+        hhmm = total > self.HHMM_THRESHOLD
+        clamped = np.where(hhmm, total >= self.HHMM_CLAMP, total >= self.MMSS_CLAMP)
+        val1 = np.where(hhmm, total // 3600, total // 60)
+        val2 = np.where(hhmm, (total % 3600) // 60, total % 60)
+        val1[clamped] = 99
+        val2[clamped] = 99
+        return Timeline(timestamps, val1, val2, hhmm, clamped)
+
+    def time_str(self, now=None):
+        val1, val2 = self.values(now)
         return f"{val1:02d}", f"{val2:02d}"
+
+    def state(self, now=None):
+        """Display state as plain data (for the browser-source state server)."""
+        if now is None:
+            now = time.time()
+        val1, val2 = self.time_str(now)
+        total_seconds = int(abs(self.epoch - now))
+        return {
+            "val1": val1,
+            "val2": val2,
+            "mode": "HH:MM" if total_seconds > self.HHMM_THRESHOLD else "MM:SS",
+            "direction": "down" if now < self.epoch else "up",
+            "target": self.target_date_str,
+            "timezone": str(self.tz),
+        }
+
+    def next_change_in(self, now=None):
+        """Seconds until the displayed value next changes, or None if it never will."""
+        if now is None:
+            now = time.time()
+        remaining = self.epoch - now
+        if remaining > 0:
+            # Counting down: the display follows floor(remaining)
+            total_seconds = int(remaining)
+            if total_seconds >= self.HHMM_CLAMP:
+                return remaining - self.HHMM_CLAMP
+            if total_seconds > self.HHMM_THRESHOLD:
+                to_minute = remaining - (total_seconds // 60) * 60
+                to_mode_switch = remaining - (self.HHMM_THRESHOLD + 1)
+                return min(to_minute, to_mode_switch)
+            if total_seconds == 0:
+                # 00:00 holds through the target until one second has elapsed
+                return remaining + 1
+            return remaining - total_seconds
+        # Counting up from the target
+        elapsed = -remaining
+        total_seconds = int(elapsed)
+        if total_seconds >= self.HHMM_CLAMP:
+            return None
+        if total_seconds > self.HHMM_THRESHOLD:
+            return (total_seconds // 60 + 1) * 60 - elapsed
+        return total_seconds + 1 - elapsed
+
+
+class TimeCalculator:
+    @staticmethod
+    def compile_target(target_date_str, current_tz):
+        return CompiledTarget(target_date_str, current_tz)
+
+    @staticmethod
+    def get_time_str(target_date_str, current_tz):
+        # Uncached path: parses and localizes the target on every call
+        return CompiledTarget(target_date_str, current_tz).time_str()
+
+    @staticmethod
+    def timeline(target_date_str, current_tz, timestamps):
+        """NumPy batch entry point: a Timeline for an array of UNIX timestamps."""
+        return CompiledTarget(target_date_str, current_tz).timeline(timestamps)
+
+    @staticmethod
+    def time_strs(target_date_str, current_tz, timestamps):
+        """Batch entry point: display strings for many UNIX timestamps."""
+        compiled = CompiledTarget(target_date_str, current_tz)
+        return [compiled.time_str(ts) for ts in timestamps]
@@ -0,0 +1,169 @@
+"""Offline export of a countdown clip, e.g. the last 10 minutes before the target.
+
+Renders every frame of a time range with the saved layout and assets,
+without a window. Consecutive frames showing the same digits are rendered
+once; the unique displays are split into contiguous chunks across a
+process pool.
+
+Usage:
+    python export.py frames/                        # PNG sequence, last 10 minutes, 30 fps
+    python export.py clip.rgba --format raw         # one raw RGBA stream
+    python export.py frames/ --start -60 --end 5 --fps 60 --workers 4
+
+Times are seconds relative to the target (negative = before it). A raw
+stream converts with e.g.
+    ffmpeg -f rawvideo -pix_fmt rgba -s 600x240 -r 30 -i clip.rgba clip.mov
+"""
+import os
+import shutil
+import sys
+import time
+
+FRAME_PATTERN = "frame_{:06d}.png"
+CHUNKS_PER_WORKER = 4  # Smaller chunks keep workers busy and the raw writer streaming
+
+_app = None
+_renderer = None
+
+
+def display_runs(compiled, start, end, fps):
+    """Group the frames of [start, end) into runs showing the same digits.
+
+    Returns [(first_frame, frame_count, val1, val2), ...] in frame order.
+    """
+    frames = max(0, round((end - start) * fps))
+    runs = []
+    for i in range(frames):
+        values = compiled.time_str(compiled.epoch + start + i / fps)
+        if runs and tuple(runs[-1][2:]) == values:
+            runs[-1][1] += 1
+        else:
+            runs.append([i, 1, *values])
+    return [tuple(run) for run in runs]
+
+
+def split_runs(runs, chunks):
+    """Contiguous, evenly sized chunks of runs (each unique display is one render)."""
+    chunks = max(1, min(chunks, len(runs)))
+    size, extra = divmod(len(runs), chunks)
+    result = []
+    begin = 0
+    for i in range(chunks):
+        end = begin + size + (1 if i < extra else 0)
+        result.append(runs[begin:end])
+        begin = end
+    return result
+
+
+def _init_worker(width, height, asset_dir):
+    global _renderer, _app
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    from PyQt5.QtCore import QSize
+    from PyQt5.QtWidgets import QApplication
+    from assets import AssetLoader
+    from rendering import FrameRenderer
+
+    _app = QApplication.instance() or QApplication([sys.argv[0]])
+    _renderer = FrameRenderer(AssetLoader(asset_dir), QSize(width, height))
+
+
+def _render_chunk(task):
+    """Render one chunk: PNG files into out_dir, or (frame_count, RGBA bytes) pairs for a stream."""
+    runs, out_dir = task
+    from headless import rgba_bytes
+
+    if out_dir is None:
+        return [(count, rgba_bytes(_renderer.render(val1, val2))) for _, count, val1, val2 in runs]
+    for first, count, val1, val2 in runs:
+        path = os.path.join(out_dir, FRAME_PATTERN.format(first))
+        _renderer.render(val1, val2).save(path, "PNG")
+        for frame in range(first + 1, first + count):
+            # Repeated frames are hard links to the rendered one where the filesystem allows
+            dup = os.path.join(out_dir, FRAME_PATTERN.format(frame))
+            if os.path.exists(dup):
+                os.remove(dup)
+            try:
+                os.link(path, dup)
+            except OSError:
+                shutil.copyfile(path, dup)
+    return sum(run[1] for run in runs)
+
+
+def export(runs, size, output, fmt="png", workers=None, asset_dir="assets"):
+    """Render runs (see display_runs) to a PNG sequence directory or a raw RGBA file ('-' = stdout)."""
+    import multiprocessing
+
+    width, height = size
+    workers = workers or os.cpu_count() or 1
+    out_dir = None
+    if fmt == "png":
+        out_dir = os.path.abspath(output)
+        os.makedirs(out_dir, exist_ok=True)
+    tasks = [(chunk, out_dir) for chunk in split_runs(runs, workers * CHUNKS_PER_WORKER)]
+    init_args = (width, height, asset_dir)
+
+    stream = None
+    if fmt == "raw":
+        if output == "-":
+            stream = sys.stdout.buffer
+            sys.stdout = sys.stderr  # Keep log prints out of the frame stream
+        else:
+            stream = open(output, "wb")
+    try:
+        if workers == 1:
+            _init_worker(*init_args)
+            results = map(_render_chunk, tasks)
+            _consume(results, stream)
+        else:
+            # spawn: workers start their own Qt instead of inheriting the parent's state
+            context = multiprocessing.get_context("spawn")
+            with context.Pool(workers, _init_worker, init_args) as pool:
+                _consume(pool.imap(_render_chunk, tasks), stream)
+    finally:
+        if stream is not None and output != "-":
+            stream.close()
+
+
+def _consume(results, stream):
+    for result in results:
+        if stream is None:
+            continue
+        for count, data in result:
+            for _ in range(count):
+                stream.write(data)
+    if stream is not None:
+        stream.flush()
+
+
+def main(argv):
+    import argparse
+    from core_utils import ConfigManager, TimeCalculator, load_timezone
+
+    parser = argparse.ArgumentParser(description="Export a countdown clip as frames")
+    parser.add_argument("output", help="directory for a PNG sequence, or a file ('-' = stdout) for --format raw")
+    parser.add_argument("--format", choices=["png", "raw"], default="png",
+                        help="png: one file per frame; raw: straight RGBA8888 frames back to back")
+    parser.add_argument("--start", type=float, default=-600, help="seconds relative to the target (default -600)")
+    parser.add_argument("--end", type=float, default=0, help="seconds relative to the target, exclusive (default 0)")
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--target", help="target date 'YYYY-MM-DD HH:MM:SS' (default: from layout_config.json)")
+    parser.add_argument("--timezone", help="IANA timezone (default: from layout_config.json)")
+    parser.add_argument("--assets", default="assets", help="asset directory (the skin)")
+    args = parser.parse_args(argv)
+
+    config = ConfigManager.window_configs(ConfigManager.load_config())[0]
+    tz = load_timezone(args.timezone or config.get("timezone", "Asia/Shanghai"))
+    compiled = TimeCalculator.compile_target(args.target or config["target_date"], tz)
+    runs = display_runs(compiled, args.start, args.end, args.fps)
+    frames = sum(run[1] for run in runs)
+
+    started = time.perf_counter()
+    export(runs, config["window_size"], args.output, args.format, args.workers, args.assets)
+    elapsed = time.perf_counter() - started
+    print(f"Exported {frames} frames ({len(runs)} unique) in {elapsed:.2f} s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
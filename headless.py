@@ -0,0 +1,123 @@
+import os
+import signal
+import sys
+from PyQt5.QtCore import QCoreApplication, QObject, QSize, QTimer
+from PyQt5.QtGui import QImage
+
+from assets import AssetLoader
+from core_utils import ConfigManager, TimeCalculator, load_timezone
+from rendering import FrameRenderer
+from tick_scheduler import TickScheduler
+
+
+class PngFrameWriter:
+    """Writes each frame to one PNG, replaced atomically so readers never see half a file."""
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.tmp_path = self.path + ".tmp"
+
+    def write(self, image):
+        if not image.save(self.tmp_path, "PNG"):
+            print(f"Failed to write frame: {self.tmp_path}")
+            return
+        os.replace(self.tmp_path, self.path)
+
+
+def rgba_bytes(image):
+    """The image as straight (non-premultiplied) RGBA8888 bytes."""
+    rgba = image.convertToFormat(QImage.Format_RGBA8888)
+    return rgba.constBits().asstring(rgba.sizeInBytes())
+
+
+class RawFrameWriter:
+    """Writes frames back to back as straight (non-premultiplied) RGBA8888 bytes."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.closed = False
+
+    def write(self, image):
+        if self.closed:
+            return
+        try:
+            self.stream.write(rgba_bytes(image))
+            self.stream.flush()
+        except BrokenPipeError:
+            # The reader went away (e.g. ffmpeg exited): stop cleanly instead of aborting in a slot
+            self.closed = True
+            print("Frame stream closed by the reader, exiting", file=sys.stderr)
+            # Point the descriptor at devnull so the interpreter's final flush cannot fail again
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, self.stream.fileno())
+            os.close(devnull)
+            # Queued: the first frame is written before the event loop runs, when quit() would be ignored
+            app = QCoreApplication.instance()
+            if app is not None:
+                QTimer.singleShot(0, app.quit)
+
+
+class HeadlessCountdown(QObject):
+    """Renders the countdown offscreen and emits a frame only when the display changes."""
+
+    def __init__(self, config, writer, tz, loader=None, parent=None):
+        super().__init__(parent)
+        self.loader = loader or AssetLoader()
+        self.compiled_target = TimeCalculator.compile_target(config["target_date"], tz)
+        w, h = config["window_size"]
+        self.renderer = FrameRenderer(self.loader, QSize(w, h))
+        self.writer = writer
+        self.last_values = None
+        self.frames = 0
+        self.ticker = TickScheduler(self.tick, self.compiled_target.next_change_in, self)
+        if config.get("watch_assets", True):
+            self.loader.watch().assets_changed.connect(self.on_assets_changed)
+
+    def start(self):
+        self.tick()
+        self.ticker.start()
+
+    def on_assets_changed(self, glyphs):
+        self.renderer.invalidate()
+        self.last_values = None
+        self.tick()
+
+    def tick(self):
+        values = self.compiled_target.time_str()
+        if values == self.last_values:
+            return
+        self.last_values = values
+        self.writer.write(self.renderer.render(*values))
+        self.frames += 1
+
+
+def make_writer(output, width, height):
+    """'-' streams raw RGBA to stdout, 'shm:PATH' publishes into shared memory,
+    anything else is a PNG path."""
+    if output.startswith("shm:"):
+        from shm_frames import SharedFrameWriter
+        return SharedFrameWriter(output[len("shm:"):], width, height)
+    if output == "-":
+        stream = sys.stdout.buffer
+        # Keep log prints out of the frame stream
+        sys.stdout = sys.stderr
+        return RawFrameWriter(stream)
+    return PngFrameWriter(output)
+
+
+def run(args, qt_argv):
+    # Must be set before the QApplication exists (QtWidgets renders the text-fallback shadow)
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    from PyQt5.QtWidgets import QApplication
+
+    # Headless output renders the first countdown of a multi-window config
+    config = ConfigManager.window_configs(ConfigManager.load_config())[0]
+    w, h = config["window_size"]
+    writer = make_writer(args.output, w, h)
+    app = QApplication(qt_argv)
+    tz = load_timezone(config.get("timezone", "Asia/Shanghai"))
+    countdown = HeadlessCountdown(config, writer, tz)
+    countdown.start()
+    # Python handlers only run between Qt slots, which can be a minute apart; let Ctrl+C end the process at once
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    return app.exec_()
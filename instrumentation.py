@@ -0,0 +1,72 @@
+import json
+import math
+from collections import deque
+
+SERIES = ("tick_lateness_ms", "update_display_ms", "paint_ms", "rescales_per_paint")
+
+
+def percentile(ordered, q):
+    """Nearest-rank percentile of an already sorted list (None when empty)."""
+    if not ordered:
+        return None
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+class FrameStats:
+    """Opt-in timing samples for the countdown window, in fixed-size ring buffers.
+
+    The window only records while an instance exists; when instrumentation
+    is off the hooks cost one attribute check.
+    """
+    CAPACITY = 2048
+
+    def __init__(self, rescales_seen=0, capacity=CAPACITY):
+        self.samples = {name: deque(maxlen=capacity) for name in SERIES}
+        self.rescales = 0  # Total since instrumentation was enabled
+        self._rescales_seen = rescales_seen
+
+    def record(self, series, value):
+        self.samples[series].append(value)
+
+    def record_rescales(self, total):
+        """Sample the resamples since the previous call, from a running total (ScaledPixmapCache.resamples)."""
+        delta = total - self._rescales_seen
+        self._rescales_seen = total
+        self.rescales += delta
+        self.record("rescales_per_paint", delta)
+
+    def summary(self):
+        result = {}
+        for name, values in self.samples.items():
+            ordered = sorted(values)
+            result[name] = {
+                "count": len(ordered),
+                "p50": percentile(ordered, 50),
+                "p95": percentile(ordered, 95),
+                "p99": percentile(ordered, 99),
+                "max": ordered[-1] if ordered else None,
+            }
+        result["rescales_total"] = self.rescales
+        return result
+
+    def format_summary(self):
+        summary = self.summary()
+        lines = []
+        for name in SERIES:
+            s = summary[name]
+            if not s["count"]:
+                lines.append(f"{name}: no samples")
+                continue
+            lines.append(f"{name} (n={s['count']}): p50 {s['p50']:.2f}  p95 {s['p95']:.2f}  "
+                         f"p99 {s['p99']:.2f}  max {s['max']:.2f}")
+        lines.append(f"rescales_total: {summary['rescales_total']}")
+        return "\n".join(lines)
+
+    def dump(self, path):
+        data = {"summary": self.summary(), "samples": {name: list(v) for name, v in self.samples.items()}}
+        try:
+            with open(path, "w") as f:
+                json.dump(data, f, indent=2)
+            print(f"Frame stats written to {path}")
+        except OSError as e:
+            print(f"Frame stats write error: {e}")
@@ -4,14 +4,14 @@ class LayoutHelper:
     @staticmethod
     def update_container_geometry(window):
         """Update the blue box to wrap around all digits"""
-        if not window.digit_labels:
+        rects = window.slot_rects()
+        if not rects:
             return
             
         min_x, min_y = 10000, 10000
         max_x, max_y = -10000, -10000
         
-        for lbl in window.digit_labels:
-            geo = lbl.geometry()
+        for geo in rects:
             min_x = min(min_x, geo.left())
             min_y = min(min_y, geo.top())
             max_x = max(max_x, geo.right())
@@ -43,21 +43,14 @@ class LayoutHelper:
         # ... (rest of the logic commented out implicitly by 'pass' and not executing)
 
     @staticmethod
-    def reset_layout(window):
-        # Use current window size or sensible default
-        w = window.width()
-        h = window.height()
-        window.resize(w, h)
-        # Background follows window rect
-        window.bg_rect = QRect(0, 0, w, h)
-        
+    def compute_slot_rects(w, h, num_digits=5):
+        """Default centered geometry of the 5 slots (digits + colon) in a w x h window"""
         # Calculate max container size (90% of window)
         max_cont_w = int(w * 0.9)
         max_cont_h = int(h * 0.8)
         
         # Target digit aspect ratio (width / height) ~ 0.66 (2:3)
         target_ratio = 0.66
-        num_digits = 5
         
         # padding inside container
         pad = 20
@@ -93,13 +86,21 @@ class LayoutHelper:
         start_x = (w - cont_w) // 2
         start_y = (h - cont_h) // 2
         
-        for i, lbl in enumerate(window.digit_labels):
-            lbl.setGeometry(
-                start_x + pad + i * digit_w, 
-                start_y + pad, 
-                digit_w, 
-                digit_h
-            )
+        return [
+            QRect(start_x + pad + i * digit_w, start_y + pad, digit_w, digit_h)
+            for i in range(num_digits)
+        ]
+
+    @staticmethod
+    def reset_layout(window):
+        # Use current window size or sensible default
+        w = window.width()
+        h = window.height()
+        window.resize(w, h)
+        # Background follows window rect
+        window.bg_rect = QRect(0, 0, w, h)
+        
+        window.set_slot_rects(LayoutHelper.compute_slot_rects(w, h))
         
         LayoutHelper.update_container_geometry(window)
         # Sync yellow to wrap blue - DECOUPLED
@@ -1,38 +1,78 @@
-import sys
-import pytz
+import time
+_STARTED = time.perf_counter()
 
-# Try importing ctypes safely
-try:
-    import ctypes
-except ImportError:
-    ctypes = None
+import os
+import sys
 
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QMenu, QAction, 
-                             QGraphicsDropShadowEffect)
-from PyQt5.QtCore import Qt, QTimer, QRect, QSize, QPoint
-from PyQt5.QtGui import QPainter, QColor, QFont, QPen, QIcon
+from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QMenu, QAction, QMessageBox
+from PyQt5.QtCore import Qt, QTimer, QRect, QSize, QPoint, QEvent
+from PyQt5.QtGui import QPainter, QPen, QIcon
 
 from assets import AssetLoader
-from widgets import DraggableLabel, ContainerWidget
-from core_utils import ConfigManager, TimeCalculator
+from utils import covered_by_fullscreen_app
+from widgets import DraggableLabel, ContainerWidget, FrameCoalescer, batched_geometry
+from core_utils import ConfigManager, TimeCalculator, get_timezone, load_timezone
 from layout_helper import LayoutHelper
 from resize_handler import ResizeHandler
+from tick_scheduler import TickScheduler, TickSource
+from rendering import GlyphAtlas, StaticLayer, TextGlyphs
 
 class CountdownWindow(QMainWindow):
-    def __init__(self):
+    OCCLUSION_POLL_MS = 1000  # Windows only: how often to check for a fullscreen app covering the window
+
+    def __init__(self, profile=None, loader=None, config=None, root_config=None, tick_source=None):
         super().__init__()
+        # StartupProfile for --profile-startup; dropped after the first paint
+        self.profile = profile
+        # Windows of one process share the loader (and its caches) and one TickSource
+        self.tick_source = tick_source
         
-        self.loader = AssetLoader()
-        self.config = ConfigManager.load_config()
-        self.current_tz = pytz.timezone('Asia/Shanghai') 
+        self.loader = loader or AssetLoader()
+        # Glyphs without an image file become text with the shadow baked in, on the same cached path
+        self.glyphs = TextGlyphs(self.loader)
+        self.mark_startup("AssetLoader")
+        # config is this window's section (see ConfigManager.window_configs); root_config is what gets saved
+        if config is None:
+            config = ConfigManager.load_config()
+            self.mark_startup("load_config")
+        self.config = config
+        self.root_config = root_config if root_config is not None else config
+        self.current_tz = load_timezone(self.config.get("timezone", "Asia/Shanghai"))
+        self.compiled_target = None
         self.is_editing = False
         self.global_resizing = False
         self.initial_window_size = None
         self.initial_digits_geo = []
         self.yellow_rect = QRect()
         
+        # Last glyph written to each slot (0,1 | colon | 3,4), for change-only updates
+        self.rendered_glyphs = [None] * 5
+        self.update_stats = {"applied": 0, "skipped": 0}
+        
+        # Idle while hidden/minimized/occluded unless a capture setup needs hidden frames
+        self.render_when_hidden = self.config.get("render_when_hidden", False)
+        self.render_active = True
+        self._watching_handle = None
+        
+        # Opt-in FrameStats (tick lateness, update/paint times, rescales); None = off
+        self.stats = None
+        self.stats_file = None
+        
+        # Optional browser-source server (see start_state_server)
+        self.state_server = None
+        self._published = None
+        
         # Background Geometry Handling
         self.bg_rect = QRect() # Relative to Window (0,0)
+        # Background + colon baked into one pixmap; rebuilt on resize/layout/asset change
+        self.static_layer = StaticLayer(self.glyphs)
+        # Nearest-neighbour background while resizing, one smooth pass once it settles
+        self.interactive_scaling = False
+        self._hq_timer = QTimer(self)
+        self._hq_timer.setSingleShot(True)
+        self._hq_timer.timeout.connect(self.end_interactive_scaling)
+        # Edit-mode window drags/resizes are applied once per frame
+        self.coalescer = FrameCoalescer(self.apply_edit_pointer, self)
         
         # Resize flags for Window
         self.window_resizing = False
@@ -47,13 +87,40 @@ class CountdownWindow(QMainWindow):
         if self.loader.icon:
             self.setWindowIcon(QIcon(self.loader.icon))
         
+        self.mark_startup("window setup")
         self.init_ui()
+        self.mark_startup("init_ui")
         self.init_timer()
+        if sys.platform == "win32":
+            # Covering by a fullscreen app raises no Qt event there; re-check it periodically
+            self._occlusion_timer = QTimer(self)
+            self._occlusion_timer.timeout.connect(self.update_visibility)
+            self._occlusion_timer.start(self.OCCLUSION_POLL_MS)
+        
+        # Pick up edited asset files without a restart
+        if self.config.get("watch_assets", True):
+            self.loader.watch().assets_changed.connect(self.on_assets_changed)
+        self.mark_startup("timer + watcher")
         
         if self.config.get("top_most", False):
             self.setWindowFlag(Qt.WindowStaysOnTopHint, True)
             self.show()
 
+    def mark_startup(self, phase):
+        if self.profile is not None:
+            self.profile.mark(phase)
+
+    def finish_startup_profile(self):
+        profile = self.profile
+        self.profile = None
+        profile.mark("first paint")
+        profile.report()
+        if profile.budget_ms is not None:
+            # Budget check run: exit non-zero when time-to-first-frame is over budget.
+            # Queued, because the first paint can happen before app.exec_() is running
+            code = 0 if profile.within_budget() else 1
+            QTimer.singleShot(0, lambda: QApplication.exit(code))
+
     def init_ui(self):
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
@@ -73,12 +140,24 @@ class CountdownWindow(QMainWindow):
             self.move(100, 100)
 
         self.digit_labels = []
+        self._slot_rects = [QRect() for _ in range(5)]
         
         # Digits Container (Blue Box)
         self.digits_container = ContainerWidget(self.central_widget)
         self.digits_container.setGeometry(50, 50, 400, 100)
         self.digits_container.hide()
         
+        # Atlas mode paints every glyph in paintEvent; labels only exist while editing
+        self.atlas = None
+        if self.config.get("render_mode") == "atlas":
+            self.atlas = GlyphAtlas(self.glyphs)
+        else:
+            self.create_digit_labels()
+
+        LayoutHelper.reset_layout(self)
+        self.update_display()
+
+    def create_digit_labels(self):
         # Create digit labels (00:00)
         for i in range(5):
             lbl = DraggableLabel(self.central_widget)
@@ -89,72 +168,234 @@ class CountdownWindow(QMainWindow):
                 lbl.setText("0")
                 lbl.setAlignment(Qt.AlignCenter)
             
-            # Default style
-            if not self.loader.digits:
-                font = QFont("Comic Sans MS", 80, QFont.Bold)
-                font.setStyleStrategy(QFont.PreferAntialias)
-                lbl.setFont(font)
-                lbl.setStyleSheet("color: white;")
-                shadow = QGraphicsDropShadowEffect()
-                shadow.setBlurRadius(10)
-                shadow.setColor(QColor(0, 0, 0, 150))
-                shadow.setOffset(2, 2)
-                lbl.setGraphicsEffect(shadow)
-            
+            if self._slot_rects[i].isValid():
+                lbl.setGeometry(self._slot_rects[i])
+            ch = self.rendered_glyphs[i]
+            if ch is not None:
+                lbl.set_glyph(self.glyphs, ch)
+            lbl.show()
             self.digit_labels.append(lbl)
             
-        if self.loader.colon:
-            self.digit_labels[2].setPixmap(self.loader.colon)
-        else:
-            self.digit_labels[2].setText(":")
+        self.digit_labels[2].set_glyph(self.glyphs, "colon")
+        self.digit_labels[2].setVisible(not self.colon_is_baked())
 
-        LayoutHelper.reset_layout(self)
-        self.update_display()
+    def colon_is_baked(self):
+        """The colon is part of the static layer unless edit mode needs its red box."""
+        return not self.is_editing
+
+    def release_digit_labels(self):
+        """Atlas mode: keep the edited geometry and drop the label widgets."""
+        self._slot_rects = self.slot_rects()
+        for lbl in self.digit_labels:
+            lbl.hide()
+            lbl.deleteLater()
+        self.digit_labels = []
+
+    def slot_rects(self):
+        if self.digit_labels:
+            return [lbl.geometry() for lbl in self.digit_labels]
+        return [QRect(r) for r in self._slot_rects]
+
+    def set_slot_rects(self, rects):
+        self._slot_rects = [QRect(r) for r in rects]
+        for lbl, rect in zip(self.digit_labels, rects):
+            lbl.setGeometry(rect)
+        self.update()
 
     def init_timer(self):
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_display)
-        self.timer.start(1000)
+        # Single-shot wakeups aligned to the next second/minute the display actually changes
+        self.ticker = TickScheduler(self.on_tick, self.next_change_in, self, self.tick_source)
+        self.ticker.start()
+
+    def on_tick(self):
+        if self.stats is not None and self.ticker.last_lateness is not None:
+            self.stats.record("tick_lateness_ms", self.ticker.last_lateness * 1000)
+        self.update_display()
+
+    def next_change_in(self, now):
+        return self.compiled_target.next_change_in(now)
 
     def save_config(self):
         # Wrapper for ConfigManager to include current state
         self.config["window_size"] = [self.width(), self.height()]
         self.config["window_pos"] = [self.x(), self.y()]
-        ConfigManager.save_config(self.config)
+        ConfigManager.save_config(self.root_config)
 
     def update_display(self):
+        stats = self.stats
+        if stats is not None:
+            started = time.perf_counter()
         target_date = self.config.get("target_date", "2026-01-01 00:00:00")
-        val1, val2 = TimeCalculator.get_time_str(target_date, self.current_tz)
+        if self.compiled_target is None or not self.compiled_target.matches(target_date, self.current_tz):
+            self.compiled_target = TimeCalculator.compile_target(target_date, self.current_tz)
+        now = time.time()
+        val1, val2 = self.compiled_target.time_str(now)
         
-        if self.loader.digits:
-            if val1[0] in self.loader.digits: self.digit_labels[0].setPixmap(self.loader.digits[val1[0]])
-            if val1[1] in self.loader.digits: self.digit_labels[1].setPixmap(self.loader.digits[val1[1]])
-            if val2[0] in self.loader.digits: self.digit_labels[3].setPixmap(self.loader.digits[val2[0]])
-            if val2[1] in self.loader.digits: self.digit_labels[4].setPixmap(self.loader.digits[val2[1]])
-        else:
-            self.digit_labels[0].setText(val1[0])
-            self.digit_labels[1].setText(val1[1])
-            self.digit_labels[3].setText(val2[0])
-            self.digit_labels[4].setText(val2[1])
+        self.set_slot_glyph(0, val1[0])
+        self.set_slot_glyph(1, val1[1])
+        self.set_slot_glyph(3, val2[0])
+        self.set_slot_glyph(4, val2[1])
+        
+        if self.state_server is not None and self._published != (val1, val2, self.compiled_target):
+            self._published = (val1, val2, self.compiled_target)
+            self.state_server.publish(self.compiled_target.state(now))
+        
+        if stats is not None:
+            stats.record("update_display_ms", (time.perf_counter() - started) * 1000)
+
+    def start_state_server(self, port):
+        from state_server import StateServer
+        self.state_server = StateServer(self.loader.asset_dir, port=port)
+        self.state_server.start()
+        self.update_display()
+
+    def on_assets_changed(self, glyphs):
+        """Hot-reload: redraw only what shows the changed glyphs; other caches stay warm."""
+        for lbl in self.digit_labels:
+            lbl.refresh_glyph(glyphs)
+        if self.atlas is not None and any(g != "bg" for g in glyphs):
+            self.atlas.invalidate()
+        if "bg" in glyphs or "colon" in glyphs:
+            self.static_layer.invalidate()
+        if self.state_server is not None:
+            self.state_server.reload_assets()
+        self.update()
+
+    def set_slot_glyph(self, slot, ch):
+        """Write a character to a digit slot, skipping slots that already show it."""
+        if self.rendered_glyphs[slot] == ch:
+            self.update_stats["skipped"] += 1
+            return
+        if ch not in self.glyphs.digits:
+            return
+        if self.digit_labels:
+            self.digit_labels[slot].set_glyph(self.glyphs, ch)
+        self.rendered_glyphs[slot] = ch
+        if not self.digit_labels:
+            self.update(self._slot_rects[slot])
+        self.update_stats["applied"] += 1
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        handle = self.windowHandle()
+        if handle is not None and handle is not self._watching_handle:
+            # Expose events live on the QWindow, not the widget
+            handle.installEventFilter(self)
+            handle.screenChanged.connect(self.on_screen_changed)
+            self._watching_handle = handle
+        self.update_visibility()
+
+    def on_screen_changed(self, screen):
+        """Moved to another screen: show the glyphs cached for its pixel ratio (rescaling only if it is new)."""
+        for lbl in self.digit_labels:
+            lbl.update_scaled_pixmap()
+        self.update()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_visibility()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self.update_visibility()
+
+    def eventFilter(self, obj, event):
+        if obj is self._watching_handle and event.type() == QEvent.Expose:
+            self.update_visibility()
+        return super().eventFilter(obj, event)
+
+    def is_on_screen(self):
+        # isExposed() catches occlusion where the platform reports it; Qt 5 on Windows does not,
+        # so there a fullscreen app on our monitor (unless we stay on top) counts as covering us
+        if not self.isVisible() or self.isMinimized():
+            return False
+        handle = self.windowHandle()
+        if handle is not None and not handle.isExposed():
+            return False
+        if not self.windowFlags() & Qt.WindowStaysOnTopHint and covered_by_fullscreen_app(int(self.winId())):
+            return False
+        return True
+
+    def update_visibility(self):
+        """Suspend ticking while nobody can see the window; catch up once when it returns."""
+        active = self.render_when_hidden or self.is_on_screen()
+        if active == self.render_active:
+            return
+        self.render_active = active
+        if active:
+            self.update_display()
+            self.ticker.start()
+            self.update()
+        elif self.state_server is None:
+            # Browser sources still need ticks while the window is hidden
+            self.ticker.stop()
+
+    def begin_interactive_scaling(self):
+        # Restarted on every resize step; fires after release or a short idle
+        self.interactive_scaling = True
+        self._hq_timer.start(DraggableLabel.HQ_DELAY_MS)
+
+    def end_interactive_scaling(self):
+        self._hq_timer.stop()
+        if self.interactive_scaling:
+            self.interactive_scaling = False
+            self.update()
+
+    def enable_stats(self, enabled, stats_file=None):
+        """Start/stop recording FrameStats; with stats_file they are dumped on exit."""
+        if enabled and self.stats is None:
+            from instrumentation import FrameStats
+            self.stats = FrameStats(self.loader.scaled_cache.resamples)
+        elif not enabled:
+            self.stats = None
+        if stats_file is not None:
+            self.stats_file = stats_file
+
+    def show_stats(self):
+        if self.stats is None:
+            return
+        memory = self.loader.memory_usage()
+        text = (f"{self.stats.format_summary()}\n"
+                f"素材内存: 原图 {memory['source_bytes'] / 1024:.0f} KB, mip {memory['mip_bytes'] / 1024:.0f} KB, "
+                f"缩放缓存 {memory['scaled_cache_bytes'] / 1024:.0f} KB")
+        QMessageBox.information(self, "性能统计 (ms)", text)
+
+    def dump_stats(self):
+        if self.stats is not None and self.stats_file:
+            self.stats.dump(self.stats_file)
+
+    def toggle_render_when_hidden(self, checked):
+        self.render_when_hidden = checked
+        self.config["render_when_hidden"] = checked
+        self.save_config()
+        self.update_visibility()
 
     def resizeEvent(self, event):
-        # Cache background only when window size changes to avoid heavy scaling during moves
-        if self.loader.bg:
-            self.bg_rect = self.rect()
-            self.cached_bg = self.loader.bg.scaled(self.bg_rect.size(), Qt.IgnoreAspectRatio, Qt.FastTransformation)
-        else:
-            self.bg_rect = self.rect()
+        # Static layer is rebuilt only when window size changes (its key), never during moves
+        self.bg_rect = self.rect()
         super().resizeEvent(event)
  
     def paintEvent(self, event):
+        if not self.render_active:
+            return
+        stats = self.stats
+        if stats is not None:
+            started = time.perf_counter()
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
         
-        # Draw Background
-        if self.loader.bg and hasattr(self, 'cached_bg') and self.cached_bg:
-            painter.drawPixmap(0, 0, self.cached_bg)
-        else:
-            painter.fillRect(self.rect(), QColor(0, 0, 0, 100))
+        # Draw Background (and the colon, outside edit mode)
+        colon_rect = self.slot_rects()[2] if self.colon_is_baked() else None
+        painter.drawPixmap(0, 0, self.static_layer.get(self.size(), colon_rect, self.devicePixelRatioF(),
+                                                      smooth=not self.interactive_scaling))
+        
+        if self.atlas is not None and not self.digit_labels:
+            self.atlas.ensure([r.size() for r in self._slot_rects], self.devicePixelRatioF())
+            for slot, rect in enumerate(self._slot_rects):
+                glyph = None if slot == 2 else self.rendered_glyphs[slot]
+                if glyph is not None and rect.intersects(event.rect()):
+                    self.atlas.draw(painter, glyph, rect)
             
         if self.is_editing:
             pen = QPen(Qt.yellow, 12, Qt.DashLine)
@@ -167,6 +408,13 @@ class CountdownWindow(QMainWindow):
             painter.drawRect(r.right() - handle_size, r.bottom() - handle_size, handle_size, handle_size)
             painter.drawRect(r.right() - handle_size, r.top() + r.height()//2 - handle_size//2, handle_size, handle_size)
             painter.drawRect(r.left() + r.width()//2 - handle_size//2, r.bottom() - handle_size, handle_size, handle_size)
+        painter.end()
+        
+        if stats is not None:
+            stats.record("paint_ms", (time.perf_counter() - started) * 1000)
+            stats.record_rescales(self.loader.scaled_cache.resamples)
+        if self.profile is not None:
+            self.finish_startup_profile()
 
     def contextMenuEvent(self, event):
         menu = QMenu(self)
@@ -191,6 +439,20 @@ class CountdownWindow(QMainWindow):
         top_action.triggered.connect(self.toggle_top_most)
         menu.addAction(top_action)
         
+        hidden_action = QAction("隐藏时继续渲染 (采集用)", self)
+        hidden_action.setCheckable(True)
+        hidden_action.setChecked(self.render_when_hidden)
+        hidden_action.triggered.connect(self.toggle_render_when_hidden)
+        menu.addAction(hidden_action)
+        
+        stats_action = QAction("记录性能数据", self)
+        stats_action.setCheckable(True)
+        stats_action.setChecked(self.stats is not None)
+        stats_action.triggered.connect(self.enable_stats)
+        menu.addAction(stats_action)
+        if self.stats is not None:
+            menu.addAction("查看性能统计", self.show_stats)
+        
         menu.addSeparator()
         
         # Timezone
@@ -215,6 +477,8 @@ class CountdownWindow(QMainWindow):
     def toggle_edit_mode(self):
         self.is_editing = not self.is_editing
         if self.is_editing:
+            if self.atlas is not None:
+                self.create_digit_labels()
             self.digits_container.show()
             self.digits_container.lower()
             self.update_container_geometry()
@@ -224,6 +488,10 @@ class CountdownWindow(QMainWindow):
             self.digits_container.hide()
         for lbl in self.digit_labels:
             lbl.set_editing(self.is_editing)
+        if not self.is_editing and self.atlas is not None:
+            self.release_digit_labels()
+        elif self.digit_labels:
+            self.digit_labels[2].setVisible(not self.colon_is_baked())
         self.update()
 
     def toggle_top_most(self, checked):
@@ -234,8 +502,11 @@ class CountdownWindow(QMainWindow):
 
     def change_timezone(self, tz_name):
         try:
-            self.current_tz = pytz.timezone(tz_name)
+            self.current_tz = get_timezone(tz_name)
+            self.config["timezone"] = tz_name
+            self.save_config()
             self.update_display()
+            self.ticker.reschedule()
         except Exception as e:
             print(f"Error setting timezone: {e}")
 
@@ -279,14 +550,23 @@ class CountdownWindow(QMainWindow):
                 if event.buttons() & Qt.LeftButton:
                     self.move(self.window_frame_pos + (event.globalPos() - self.drag_start_pos))
             else:
-                if self.global_resizing:
-                    ResizeHandler.handle_global_resize(self, event)
-                elif self.is_yellow_dragging:
-                    delta = event.globalPos() - self.drag_start_global
-                    self.move(self.window_frame_pos + delta)
-                    self.update()
+                if self.global_resizing or self.is_yellow_dragging:
+                    self.coalescer.post((event.globalPos(), event.modifiers()))
+
+    def apply_edit_pointer(self, state):
+        # At most once per frame, with the latest pointer position only
+        global_pos, modifiers = state
+        with batched_geometry(self):
+            if self.global_resizing:
+                ResizeHandler.handle_global_resize(self, global_pos, modifiers)
+            elif self.is_yellow_dragging:
+                delta = global_pos - self.drag_start_global
+                self.move(self.window_frame_pos + delta)
 
     def mouseReleaseEvent(self, event):
+        self.coalescer.flush()
+        if self.global_resizing:
+            self.end_interactive_scaling()
         self.window_resizing = False
         self.global_resizing = False
         self.is_yellow_dragging = False
@@ -303,12 +583,71 @@ class CountdownWindow(QMainWindow):
     def ensure_bounds(self):
         LayoutHelper.ensure_bounds(self)
 
+def parse_args(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="mmticktock countdown")
+    parser.add_argument("--headless", action="store_true",
+                        help="render offscreen (no window) and write frames on each display change")
+    parser.add_argument("--output", default="frame.png",
+                        help="headless output: a PNG path (replaced atomically), '-' for raw RGBA on stdout, "
+                             "or shm:PATH for a double-buffered shared-memory file")
+    parser.add_argument("--state-server", type=int, metavar="PORT",
+                        help="serve the display state to browser sources on http://127.0.0.1:PORT/")
+    parser.add_argument("--frame-stats", nargs="?", const="frame_stats.json", metavar="PATH",
+                        help="record tick lateness, update/paint times and rescales; "
+                             "write p50/p95/p99 and the samples to PATH on exit (default frame_stats.json)")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print how long each startup phase took, up to the first painted frame")
+    parser.add_argument("--startup-budget", type=float, metavar="MS",
+                        help="profile startup, then exit after the first frame; "
+                             "exit status 1 if it took longer than MS milliseconds")
+    # Unknown arguments are passed on to Qt
+    return parser.parse_known_args(argv)
+
 if __name__ == "__main__":
-    if ctypes:
+    args, qt_args = parse_args(sys.argv[1:])
+    if args.headless:
+        import headless
+        sys.exit(headless.run(args, [sys.argv[0]] + qt_args))
+    profile = None
+    if args.profile_startup or args.startup_budget is not None:
+        from startup_profile import StartupProfile
+        profile = StartupProfile(_STARTED, args.startup_budget)
+        profile.mark("imports")
+    if sys.platform == "win32":
         try:
+            import ctypes
             ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID('yzxmm.mmticktock.countdown.1.0')
         except: pass
-    app = QApplication(sys.argv)
-    window = CountdownWindow()
-    window.show()
+    # Per-screen scale factors: glyphs are rendered at each screen's own pixel ratio instead of being stretched
+    QApplication.setAttribute(Qt.AA_EnableHighDpiScaling)
+    QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps)
+    if hasattr(QApplication, "setHighDpiScaleFactorRoundingPolicy"):
+        QApplication.setHighDpiScaleFactorRoundingPolicy(Qt.HighDpiScaleFactorRoundingPolicy.PassThrough)
+    app = QApplication([sys.argv[0]] + qt_args)
+    app.aboutToQuit.connect(ConfigManager.flush)
+    if profile is not None:
+        profile.mark("QApplication")
+    config = ConfigManager.load_config()
+    if profile is not None:
+        profile.mark("load_config")
+    # One window per section of the config's "windows" list, sharing assets and the tick timer
+    tick_source = TickSource()
+    windows = []
+    for section in ConfigManager.window_configs(config):
+        loader = windows[0].loader if windows else None
+        windows.append(CountdownWindow(profile if not windows else None, loader, section, config, tick_source))
+    window = windows[0]
+    if args.frame_stats:
+        # Every countdown records; windows after the first dump to frame_stats_1.json, frame_stats_2.json, ...
+        base, ext = os.path.splitext(args.frame_stats)
+        for i, w in enumerate(windows):
+            w.enable_stats(True, args.frame_stats if i == 0 else f"{base}_{i}{ext}")
+            app.aboutToQuit.connect(w.dump_stats)
+    # The browser source shows the first countdown only
+    state_port = args.state_server or window.config.get("state_server_port")
+    if state_port:
+        window.start_state_server(state_port)
+    for w in windows:
+        w.show()
     sys.exit(app.exec_())
@@ -0,0 +1,269 @@
+from collections import OrderedDict
+from PyQt5.QtCore import Qt, QRect, QRectF, QSize
+from PyQt5.QtGui import QColor, QFont, QImage, QPainter, QPixmap
+from layout_helper import LayoutHelper
+
+GLYPHS = [str(i) for i in range(10)] + ["colon"]
+KEEP_DPRS = 2  # Pixel ratios kept built: the current screen's and the previous one's
+
+
+def default_text_font():
+    font = QFont("Comic Sans MS", 80, QFont.Bold)
+    font.setStyleStrategy(QFont.PreferAntialias)
+    return font
+
+
+class TextGlyphs:
+    """Text-fallback glyphs with the drop shadow baked in, behind the AssetLoader interface.
+
+    Glyphs without an asset file are rasterized once per label size, pixel
+    ratio and font, and cached in the loader's scaled cache, so labels, the
+    atlas and the static layer use the same fast path as PNG assets. Glyphs
+    the loader does have (also ones added later by hot reload) come from it.
+    The shadow is rendered through QtWidgets, so this needs a QApplication.
+    """
+    SHADOW_BLUR = 10
+    SHADOW_OFFSET = 2
+    SHADOW_COLOR = QColor(0, 0, 0, 150)
+
+    def __init__(self, loader, font=None):
+        self.loader = loader
+        self.scaled_cache = loader.scaled_cache
+        self.digits = [str(i) for i in range(10)]
+        self.set_font(font or default_text_font())
+
+    def set_font(self, font):
+        self.font = QFont(font)
+        self.namespace = ("text", self.font.key())  # Cache keys change with the font
+
+    def has(self, glyph):
+        return glyph in self.digits or glyph == "colon" or self.loader.has(glyph)
+
+    @property
+    def bg(self):
+        return self.loader.bg
+
+    def scaled(self, glyph, size, dpr=1.0, smooth=True):
+        """Same contract as AssetLoader.scaled; smooth=False skips the blur and is not cached."""
+        if self.loader.has(glyph) or not self.has(glyph):
+            return self.loader.scaled(glyph, size, dpr, smooth)
+        w, h = size.width(), size.height()
+        if w <= 1 or h <= 1:
+            return None
+        key = (self.namespace, glyph, w, h, dpr)
+        pixmap = self.scaled_cache.get(key)
+        if pixmap is None:
+            self.scaled_cache.resamples += 1
+            pixmap = self._render(":" if glyph == "colon" else glyph, w, h, dpr, smooth)
+            if smooth:
+                self.scaled_cache.put(key, pixmap)
+        return pixmap
+
+    def _render(self, text, w, h, dpr, blur):
+        pw, ph = round(w * dpr), round(h * dpr)
+        rect = QRect(0, 0, w, h)
+        glyph = QImage(pw, ph, QImage.Format_ARGB32_Premultiplied)
+        glyph.fill(Qt.transparent)
+        painter = QPainter(glyph)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        painter.scale(dpr, dpr)
+        painter.setFont(self.font)
+        if not blur:
+            # Interactive resize: a hard shadow is close enough and costs one extra drawText
+            painter.setPen(self.SHADOW_COLOR)
+            painter.drawText(rect.translated(self.SHADOW_OFFSET, self.SHADOW_OFFSET), Qt.AlignCenter, text)
+        painter.setPen(Qt.white)
+        painter.drawText(rect, Qt.AlignCenter, text)
+        painter.end()
+        if blur:
+            glyph = self._with_shadow(glyph, dpr)
+        glyph.setDevicePixelRatio(dpr)
+        return QPixmap.fromImage(glyph)
+
+    def _with_shadow(self, glyph, dpr):
+        """Run the same QGraphicsDropShadowEffect the labels used to carry, once, into an image."""
+        from PyQt5.QtWidgets import QGraphicsDropShadowEffect, QGraphicsScene
+
+        scene = QGraphicsScene()
+        item = scene.addPixmap(QPixmap.fromImage(glyph))
+        shadow = QGraphicsDropShadowEffect()
+        shadow.setBlurRadius(self.SHADOW_BLUR * dpr)
+        shadow.setColor(self.SHADOW_COLOR)
+        shadow.setOffset(self.SHADOW_OFFSET * dpr, self.SHADOW_OFFSET * dpr)
+        item.setGraphicsEffect(shadow)
+        result = QImage(glyph.size(), QImage.Format_ARGB32_Premultiplied)
+        result.fill(Qt.transparent)
+        painter = QPainter(result)
+        bounds = QRectF(0, 0, glyph.width(), glyph.height())
+        scene.render(painter, bounds, bounds)
+        painter.end()
+        return result
+
+
+class GlyphAtlas:
+    """The 0-9 and colon glyphs packed into one pixmap, one row per slot size.
+
+    Lets the window blit every glyph from a single texture in its own
+    paintEvent instead of compositing one QLabel per digit. One atlas is
+    kept per recent pixel ratio, so moving between screens swaps atlases.
+    """
+
+    def __init__(self, loader):
+        self.loader = loader
+        self.pixmap = None
+        self.dpr = 1.0
+        self._sizes = ()
+        self._rects = {}  # (glyph, w, h) -> source rect in atlas pixels
+        self._built = OrderedDict()  # dpr -> (sizes, pixmap, rects)
+
+    def invalidate(self):
+        self.pixmap = None
+        self._built.clear()
+
+    def ensure(self, sizes, dpr=1.0):
+        """(Re)pack the atlas if the set of slot sizes or the pixel ratio changed."""
+        sizes = tuple(sorted({(s.width(), s.height()) for s in sizes if s.width() > 1 and s.height() > 1}))
+        if self.pixmap is not None and sizes == self._sizes and dpr == self.dpr:
+            return
+        built = self._built.get(dpr)
+        if built is not None and built[0] == sizes:
+            self._sizes, self.pixmap, self._rects = built
+            self.dpr = dpr
+            self._built.move_to_end(dpr)
+            return
+        self._sizes = sizes
+        self.dpr = dpr
+        self._build()
+        self._built[dpr] = (sizes, self.pixmap, self._rects)
+        self._built.move_to_end(dpr)
+        while len(self._built) > KEEP_DPRS:
+            self._built.popitem(last=False)
+
+    def _build(self):
+        self._rects = {}
+        cells = [(w, h, round(w * self.dpr), round(h * self.dpr)) for w, h in self._sizes]
+        width = max([pw for _, _, pw, _ in cells] or [1]) * len(GLYPHS)
+        height = max(1, sum(ph for _, _, _, ph in cells))
+
+        image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        y = 0
+        for w, h, pw, ph in cells:
+            for i, glyph in enumerate(GLYPHS):
+                scaled = self.loader.scaled(glyph, QSize(w, h), self.dpr)
+                if scaled is None:
+                    continue
+                target = QRect(i * pw, y, pw, ph)
+                painter.drawPixmap(target, scaled)
+                self._rects[(glyph, w, h)] = target
+            y += ph
+        painter.end()
+        self.pixmap = QPixmap.fromImage(image)
+
+    def draw(self, painter, glyph, rect):
+        src = self._rects.get((glyph, rect.width(), rect.height()))
+        if src is None or self.pixmap is None:
+            return False
+        painter.drawPixmap(rect, self.pixmap, src)
+        return True
+
+
+class StaticLayer:
+    """Scaled background and colon pre-blended into one premultiplied pixmap.
+
+    Nothing in it changes during a normal tick, so a repaint is one blit of
+    this layer plus the digits. It is rebuilt when the window size or the
+    colon geometry changes, or after invalidate() (asset change). Each recent
+    pixel ratio has its own layer, so a screen change does not rebuild it.
+    """
+
+    def __init__(self, loader):
+        self.loader = loader
+        self.pixmap = None
+        self._key = None
+        self._layers = OrderedDict()  # dpr -> (key, pixmap)
+
+    def invalidate(self):
+        self.pixmap = None
+        self._layers.clear()
+
+    def get(self, size, colon_rect=None, dpr=1.0, smooth=True):
+        """smooth=False while the window is being resized: nearest-neighbour background."""
+        colon_key = None
+        if colon_rect is not None:
+            colon_key = (colon_rect.x(), colon_rect.y(), colon_rect.width(), colon_rect.height())
+        key = (size.width(), size.height(), colon_key, dpr, smooth)
+        if self.pixmap is not None and key == self._key:
+            return self.pixmap
+        layer = self._layers.get(dpr)
+        if layer is not None and layer[0] == key:
+            self._key, self.pixmap = layer
+        else:
+            self._key = key
+            self.pixmap = self._build(size, colon_rect, dpr, smooth)
+            self._layers[dpr] = (key, self.pixmap)
+        self._layers.move_to_end(dpr)
+        while len(self._layers) > KEEP_DPRS:
+            self._layers.popitem(last=False)
+        return self.pixmap
+
+    def _build(self, size, colon_rect, dpr, smooth):
+        image = QImage(max(1, round(size.width() * dpr)), max(1, round(size.height() * dpr)),
+                       QImage.Format_ARGB32_Premultiplied)
+        image.setDevicePixelRatio(dpr)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        rect = QRect(0, 0, size.width(), size.height())
+        bg = self.loader.scaled("bg", size, dpr) if smooth else None
+        if bg is not None:
+            painter.drawPixmap(rect, bg)
+        elif self.loader.has("bg"):
+            # Fast scaling: the window size changes continuously while resizing
+            painter.drawPixmap(rect, self.loader.bg)
+        else:
+            painter.fillRect(rect, QColor(0, 0, 0, 100))
+        if colon_rect is not None:
+            colon = self.loader.scaled("colon", colon_rect.size(), dpr)
+            if colon is not None:
+                painter.drawPixmap(colon_rect, colon)
+        painter.end()
+        return QPixmap.fromImage(image)
+
+
+class FrameRenderer:
+    """Renders the window composition (background, colon, digits) into a QImage.
+
+    Used where there is no visible window: headless capture output, export
+    and the benchmarks. The slot layout defaults to LayoutHelper's centered
+    layout. Missing images fall back to the same TextGlyphs as the window.
+    """
+
+    def __init__(self, loader, size, slot_rects=None):
+        self.loader = loader
+        self.glyphs = TextGlyphs(loader)
+        self.size = QSize(size)
+        if slot_rects is None:
+            slot_rects = LayoutHelper.compute_slot_rects(size.width(), size.height())
+        self.slot_rects = [QRect(r) for r in slot_rects]
+        self.static_layer = StaticLayer(self.glyphs)
+        self.atlas = GlyphAtlas(self.glyphs)
+        self.image = QImage(self.size, QImage.Format_ARGB32_Premultiplied)
+
+    def invalidate(self):
+        """Drop the composed layers after an asset change."""
+        self.static_layer.invalidate()
+        self.atlas.invalidate()
+
+    def render(self, val1, val2):
+        glyphs = [val1[0], val1[1], ":", val2[0], val2[1]]
+        self.image.fill(Qt.transparent)
+        painter = QPainter(self.image)
+        # The colon is baked into the static layer, as in the window outside edit mode
+        painter.drawPixmap(0, 0, self.static_layer.get(self.size, self.slot_rects[2]))
+        self.atlas.ensure([r.size() for r in self.slot_rects])
+        for slot, rect in enumerate(self.slot_rects):
+            if slot != 2:
+                self.atlas.draw(painter, glyphs[slot], rect)
+        painter.end()
+        return self.image
@@ -3,8 +3,8 @@ from layout_helper import LayoutHelper
 
 class ResizeHandler:
     @staticmethod
-    def handle_global_resize(window, event):
-        delta = event.globalPos() - window.window_resize_start_pos
+    def handle_global_resize(window, global_pos, modifiers):
+        delta = global_pos - window.window_resize_start_pos
         mode = getattr(window, 'resize_mode', 'bottom-right')
         
         # Calculate new size based on mode
@@ -22,7 +22,7 @@ class ResizeHandler:
             new_h = max(50, window.initial_window_size.height() + delta.y())
             
         # Shift Aspect Ratio Logic
-        if (event.modifiers() & Qt.ShiftModifier) and window.initial_window_size.height() > 0:
+        if (modifiers & Qt.ShiftModifier) and window.initial_window_size.height() > 0:
             ratio = window.initial_window_size.width() / window.initial_window_size.height()
             
             if mode == 'bottom-right':
@@ -40,8 +40,9 @@ class ResizeHandler:
         # Actually window.initial_yellow_rect might not be set correctly in main.py changes?
         # Let's verify main.py logic too. But here r0 is not used.
         
-        # Resize window directly
+        # Resize window directly; the background stays nearest-neighbour until the drag settles
         window.global_resizing = True
+        window.begin_interactive_scaling()
         window.resize(new_w, new_h)
         window.bg_rect = QRect(0, 0, new_w, new_h)
         window.yellow_rect = QRect(0, 0, new_w, new_h)
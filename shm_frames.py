@@ -0,0 +1,178 @@
+"""Shared-memory frame output for capture software.
+
+The producer keeps two RGBA8888 (straight alpha) frame buffers in a
+memory-mapped file behind a small header. It draws each new frame into the
+buffer consumers are *not* reading, then flips `front` and bumps `seq`.
+A consumer maps the same file and reads pixels in place: no copy, no encode.
+
+Layout (little endian):
+    0   4s  magic "MMTK"
+    4   u32 version
+    8   u32 width
+    12  u32 height
+    16  u32 stride (bytes per row)
+    20  u32 front (index of the buffer holding the latest frame)
+    24  u64 seq (0 = no frame yet)
+    32  f64 timestamp (time.time() when the frame was published)
+    40  u64 buffer_size (bytes per buffer)
+    64  buffer 0, then buffer 1
+
+A frame read from buffer `front` stays intact until the producer has
+published two more frames, so a reader checks `seq` again after using it.
+
+Reference reader:
+    python shm_frames.py PATH
+"""
+import mmap
+import os
+import struct
+import sys
+import time
+from collections import namedtuple
+
+MAGIC = b"MMTK"
+VERSION = 1
+HEADER = struct.Struct("<4sIIIIIQdQ")
+HEADER_SIZE = 64
+
+FrameHeader = namedtuple("FrameHeader", "magic version width height stride front seq timestamp buffer_size")
+
+
+class SharedFrameWriter:
+    """Producer side; implements the same write(image) interface as the headless writers."""
+
+    def __init__(self, path, width, height):
+        # Qt is only needed to draw into the buffers; the reader stays stdlib-only
+        import ctypes
+        from PyQt5 import sip
+        from PyQt5.QtGui import QImage
+
+        self.path = os.path.abspath(path)
+        self.width = width
+        self.height = height
+        self.stride = width * 4
+        self.buffer_size = self.stride * height
+        total = HEADER_SIZE + 2 * self.buffer_size
+
+        self._file = open(self.path, "w+b")
+        self._file.truncate(total)
+        self._mm = mmap.mmap(self._file.fileno(), total)
+        self.front = 0
+        self.seq = 0
+
+        # QImages that paint straight into the mapped buffers
+        self._anchors = []
+        self._targets = []
+        for index in range(2):
+            offset = HEADER_SIZE + index * self.buffer_size
+            anchor = (ctypes.c_char * self.buffer_size).from_buffer(self._mm, offset)
+            image = QImage(sip.voidptr(ctypes.addressof(anchor)), width, height,
+                           self.stride, QImage.Format_RGBA8888)
+            self._anchors.append(anchor)
+            self._targets.append(image)
+        self._publish(0.0)
+
+    def write(self, image):
+        from PyQt5.QtGui import QPainter
+
+        back = 1 - self.front
+        painter = QPainter(self._targets[back])
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        painter.drawImage(0, 0, image)
+        painter.end()
+        self.front = back
+        self.seq += 1
+        self._publish(time.time())
+
+    def _publish(self, timestamp):
+        HEADER.pack_into(self._mm, 0, MAGIC, VERSION, self.width, self.height, self.stride,
+                         self.front, self.seq, timestamp, self.buffer_size)
+
+    def close(self):
+        # The buffer exports must be gone before the mapping can close
+        self._targets = []
+        self._anchors = []
+        self._mm.close()
+        self._file.close()
+
+
+class SharedFrameReader:
+    """Consumer side: maps the file read-only and hands out views of the latest frame."""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.last_seq = 0
+
+    def header(self):
+        # The producer may be mid-update; accept the header once two reads agree
+        while True:
+            first = HEADER.unpack_from(self._mm, 0)
+            if HEADER.unpack_from(self._mm, 0) == first:
+                return FrameHeader(*first)
+
+    def poll(self):
+        """Return (header, memoryview of the RGBA rows) for a new frame, or None.
+
+        The view points into the shared mapping; copy it if it must outlive
+        the next frame, and release() it before close().
+        """
+        header = self.header()
+        if header.magic != MAGIC or header.seq == self.last_seq:
+            return None
+        self.last_seq = header.seq
+        offset = HEADER_SIZE + header.front * header.buffer_size
+        view = memoryview(self._mm)[offset:offset + header.stride * header.height]
+        return header, view
+
+    def is_intact(self, header):
+        """True while the buffer read for `header` has not been overwritten."""
+        return self.header().seq - header.seq <= 1
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+
+def latency_consumer(path, frames, ready, results, timeout=30.0):
+    """Poll for `frames` frames and report producer-to-consumer delays in seconds."""
+    reader = SharedFrameReader(path)
+    ready.set()
+    latencies = []
+    deadline = time.time() + timeout
+    while len(latencies) < frames and time.time() < deadline:
+        frame = reader.poll()
+        if frame is None:
+            time.sleep(0.0002)
+            continue
+        header, view = frame
+        latencies.append(time.time() - header.timestamp)
+        view.release()
+    reader.close()
+    results.put(latencies)
+
+
+def main(argv):
+    if not argv:
+        print(__doc__)
+        return 2
+    reader = SharedFrameReader(argv[0])
+    try:
+        while True:
+            frame = reader.poll()
+            if frame is None:
+                time.sleep(0.01)
+                continue
+            header, view = frame
+            latency_ms = (time.time() - header.timestamp) * 1000
+            print(f"seq={header.seq} {header.width}x{header.height} latency={latency_ms:.2f} ms")
+            view.release()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reader.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
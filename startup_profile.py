@@ -0,0 +1,33 @@
+import time
+
+
+class StartupProfile:
+    """Wall-clock time per startup phase, for --profile-startup / --startup-budget."""
+
+    def __init__(self, start=None, budget_ms=None):
+        self.start = time.perf_counter() if start is None else start
+        self.budget_ms = budget_ms
+        self.phases = []
+        self._last = self.start
+
+    def mark(self, phase):
+        """Close the phase that has been running since the previous mark."""
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self._last) * 1000))
+        self._last = now
+
+    @property
+    def total_ms(self):
+        return (self._last - self.start) * 1000
+
+    def within_budget(self):
+        return self.budget_ms is None or self.total_ms <= self.budget_ms
+
+    def report(self):
+        print("Startup profile:")
+        for phase, ms in self.phases:
+            print(f"  {phase:<16} {ms:8.1f} ms")
+        print(f"  {'first frame':<16} {self.total_ms:8.1f} ms")
+        if self.budget_ms is not None:
+            verdict = "ok" if self.within_budget() else "EXCEEDED"
+            print(f"  budget {self.budget_ms:.0f} ms: {verdict}")
@@ -0,0 +1,252 @@
+"""Localhost HTTP + WebSocket server for OBS browser sources.
+
+Runs an asyncio loop on its own thread, so the Qt thread only pays for one
+call_soon_threadsafe() per display change. Routes:
+    /              minimal page that renders the digits from the asset PNGs
+    /ws            WebSocket; pushes the display state as JSON on each change
+    /state         latest display state as JSON
+    /assets/N.png  digit, colon and background images
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import struct
+import threading
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+ASSET_NAMES = {str(i) for i in range(10)} | {"colon", "bg"}
+MAX_CLIENT_BACKLOG = 64 * 1024  # Drop WebSocket clients that stop reading
+MAX_FRAME = 64 * 1024
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>mmticktock</title>
+<style>
+html, body { margin: 0; height: 100%; background: transparent; overflow: hidden; }
+#clock { width: 100vw; height: 100vh; display: flex; align-items: center; justify-content: center;
+         background: center / 100% 100% no-repeat; }
+#clock img { height: 60vh; width: calc(60vh * 0.66); }
+</style></head>
+<body><div id="clock">
+<img id="s0" alt=""><img id="s1" alt=""><img id="colon" alt=":"><img id="s3" alt=""><img id="s4" alt="">
+</div>
+<script>
+const slots = ["s0", "s1", "s3", "s4"].map(id => document.getElementById(id));
+const clock = document.getElementById("clock");
+const colon = document.getElementById("colon");
+let version = null;
+function show(state) {
+  // assets_version changes when the app hot-reloads an asset file
+  const v = "?v=" + state.assets_version;
+  const chars = state.val1 + state.val2;
+  slots.forEach((img, i) => {
+    const src = "/assets/" + chars[i] + ".png" + v;
+    if (img.getAttribute("src") !== src) img.setAttribute("src", src);
+  });
+  if (version !== v) {
+    version = v;
+    colon.setAttribute("src", "/assets/colon.png" + v);
+    clock.style.backgroundImage = "url(/assets/bg.png" + v + ")";
+  }
+}
+function connect() {
+  const ws = new WebSocket("ws://" + location.host + "/ws");
+  ws.onmessage = e => show(JSON.parse(e.data));
+  ws.onclose = () => setTimeout(connect, 1000);
+}
+connect();
+</script></body></html>
+"""
+
+
+def _ws_frame(payload, opcode=0x1):
+    header = bytes([0x80 | opcode])
+    n = len(payload)
+    if n < 126:
+        header += bytes([n])
+    elif n < 65536:
+        header += bytes([126]) + struct.pack("!H", n)
+    else:
+        header += bytes([127]) + struct.pack("!Q", n)
+    return header + payload
+
+
+async def _read_ws_frame(reader):
+    head = await reader.readexactly(2)
+    opcode = head[0] & 0x0F
+    masked = head[1] & 0x80
+    length = head[1] & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", await reader.readexactly(8))[0]
+    if length > MAX_FRAME:
+        raise ConnectionError("WebSocket frame too large")
+    mask = await reader.readexactly(4) if masked else b""
+    payload = await reader.readexactly(length)
+    if masked:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return opcode, payload
+
+
+class StateServer:
+    def __init__(self, asset_dir, host="127.0.0.1", port=8765):
+        self.asset_dir = asset_dir
+        self.host = host
+        self.port = port
+        self.state = None
+        self.clients = set()
+        self._asset_bytes = {}
+        self.asset_version = 0
+        self._loop = None
+        self._thread = None
+
+    def start(self):
+        started = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(started,), name="state-server", daemon=True)
+        self._thread.start()
+        started.wait(5)
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def publish(self, state):
+        """Thread-safe: queue a state dict for every connected client."""
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(self._broadcast, state)
+
+    def reload_assets(self):
+        """Thread-safe: serve asset files fresh and tell clients to refetch them."""
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(self._reload_assets)
+        else:
+            self._asset_bytes = {}
+            self.asset_version += 1
+
+    def _reload_assets(self):
+        self._asset_bytes = {}
+        self.asset_version += 1
+        if self.state is not None:
+            self._broadcast(self.state)
+
+    def _run(self, started):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            server = loop.run_until_complete(asyncio.start_server(self._handle, self.host, self.port))
+        except OSError as e:
+            print(f"State server error: {e}")
+            started.set()
+            loop.close()
+            return
+        self._loop = loop
+        print(f"State server listening on http://{self.host}:{self.port}/")
+        started.set()
+        try:
+            loop.run_forever()
+        finally:
+            server.close()
+            loop.run_until_complete(server.wait_closed())
+            loop.close()
+
+    def _broadcast(self, state):
+        self.state = dict(state, assets_version=self.asset_version)
+        frame = _ws_frame(json.dumps(self.state).encode())
+        for writer in list(self.clients):
+            if writer.transport.get_write_buffer_size() > MAX_CLIENT_BACKLOG:
+                self.clients.discard(writer)
+                writer.close()
+                continue
+            writer.write(frame)
+
+    def _asset(self, name):
+        if name not in self._asset_bytes:
+            path = os.path.join(self.asset_dir, f"{name}.png")
+            try:
+                with open(path, "rb") as f:
+                    self._asset_bytes[name] = f.read()
+            except OSError:
+                self._asset_bytes[name] = None
+        return self._asset_bytes[name]
+
+    @staticmethod
+    def _respond(writer, status, content_type, body, extra_headers=""):
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}[status]
+        writer.write((f"HTTP/1.1 {status} {reason}\r\n"
+                      f"Content-Type: {content_type}\r\n"
+                      f"Content-Length: {len(body)}\r\n"
+                      f"{extra_headers}"
+                      "Connection: close\r\n\r\n").encode() + body)
+
+    async def _handle(self, reader, writer):
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        lines = request.decode("latin-1").split("\r\n")
+        parts = lines[0].split(" ")
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+        try:
+            if len(parts) < 2 or parts[0] != "GET":
+                self._respond(writer, 405, "text/plain", b"GET only")
+                await writer.drain()
+                return
+            path = parts[1].split("?", 1)[0]
+            if path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                await self._serve_websocket(reader, writer, headers)
+                return
+            if path == "/":
+                self._respond(writer, 200, "text/html; charset=utf-8", PAGE.encode())
+            elif path == "/state":
+                self._respond(writer, 200, "application/json", json.dumps(self.state).encode())
+            elif path.startswith("/assets/") and path.endswith(".png") and path[8:-4] in ASSET_NAMES:
+                data = self._asset(path[8:-4])
+                if data is None:
+                    self._respond(writer, 404, "text/plain", b"Not found")
+                else:
+                    self._respond(writer, 200, "image/png", data, "Cache-Control: max-age=3600\r\n")
+            else:
+                self._respond(writer, 404, "text/plain", b"Not found")
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _serve_websocket(self, reader, writer, headers):
+        key = headers.get("sec-websocket-key")
+        if not key:
+            self._respond(writer, 400, "text/plain", b"Missing Sec-WebSocket-Key")
+            await writer.drain()
+            return
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\n"
+                      "Upgrade: websocket\r\n"
+                      "Connection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode())
+        if self.state is not None:
+            writer.write(_ws_frame(json.dumps(self.state).encode()))
+        self.clients.add(writer)
+        try:
+            # Clients never need to send anything; only answer ping and close
+            while True:
+                opcode, payload = await _read_ws_frame(reader)
+                if opcode == 0x8:
+                    writer.write(_ws_frame(payload[:2], opcode=0x8))
+                    await writer.drain()
+                    break
+                if opcode == 0x9:
+                    writer.write(_ws_frame(payload, opcode=0xA))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.clients.discard(writer)
@@ -0,0 +1,111 @@
+import math
+import time
+from PyQt5.QtCore import Qt, QObject, QTimer
+
+
+class TickSource(QObject):
+    """One precise single-shot timer shared by any number of TickSchedulers.
+
+    It always sleeps until the earliest pending boundary of its active
+    schedulers, so N countdowns cost one timer and at most one wakeup per
+    distinct boundary.
+    """
+    DUE_TOLERANCE = 0.001  # Schedulers due within this many seconds fire on the same wakeup
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.clients = []
+        self.scheduled_at = None
+        self.wakeups = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def add(self, client):
+        if client not in self.clients:
+            self.clients.append(client)
+        self.rearm()
+
+    def remove(self, client):
+        if client in self.clients:
+            self.clients.remove(client)
+        self.rearm()
+
+    def rearm(self):
+        due = [c.scheduled_at for c in self.clients if c.scheduled_at is not None]
+        if not due:
+            self._timer.stop()
+            self.scheduled_at = None
+            return
+        self.scheduled_at = min(due)
+        self._timer.start(max(0, math.ceil((self.scheduled_at - time.time()) * 1000)))
+
+    def _on_timeout(self):
+        self.wakeups += 1
+        now = time.time()
+        for client in list(self.clients):
+            if client.scheduled_at is not None and client.scheduled_at <= now + self.DUE_TOLERANCE:
+                client.fire(now)
+        self.rearm()
+
+
+class TickScheduler(QObject):
+    """Wakes up just after each real display boundary instead of every 1000 ms.
+
+    Each wake schedules the next one from the wall clock, so a late wakeup
+    never shifts the following ones (no drift), and HH:MM mode only wakes
+    once a minute. Schedulers given the same TickSource share its timer.
+    """
+    SLACK_MS = 2          # Land just after the boundary, never just before
+    MAX_WAIT_MS = 60000   # Re-check at least once a minute (clock changes, sleep)
+
+    def __init__(self, callback, next_change_in, parent=None, source=None):
+        super().__init__(parent)
+        self.callback = callback
+        self.next_change_in = next_change_in  # now -> seconds until next change, or None
+        self.source = source if source is not None else TickSource(self)
+        self.scheduled_at = None  # Wall-clock time the pending wakeup aims for
+        self.boundary = None      # The display boundary it waits for (None for a MAX_WAIT re-check)
+        self.last_lateness = None  # Seconds the last wakeup fired after its boundary
+        self.wakeups = 0
+
+    def start(self):
+        self._schedule(time.time())
+        self.source.add(self)
+
+    def stop(self):
+        self.scheduled_at = None
+        self.source.remove(self)
+
+    def is_active(self):
+        return self in self.source.clients
+
+    def reschedule(self):
+        """Re-align after the target or timezone changed."""
+        if self.is_active():
+            self._schedule(time.time())
+            self.source.rearm()
+
+    def _schedule(self, now):
+        wait = self.next_change_in(now)
+        self.boundary = None
+        if wait is None:
+            wait_ms = self.MAX_WAIT_MS
+        else:
+            wait_ms = max(0, math.ceil(wait * 1000)) + self.SLACK_MS
+            if wait_ms <= self.MAX_WAIT_MS:
+                self.boundary = now + max(0.0, wait)
+            else:
+                wait_ms = self.MAX_WAIT_MS
+        self.scheduled_at = now + wait_ms / 1000
+
+    def fire(self, now):
+        """Called by the TickSource once this scheduler's boundary has passed."""
+        self.wakeups += 1
+        # Against the boundary itself, so SLACK_MS and the ms rounding count as lateness too
+        self.last_lateness = None if self.boundary is None else now - self.boundary
+        self.callback()
+        if self.is_active():
+            self._schedule(time.time())
@@ -19,3 +19,38 @@ def resource_path(relative_path):
         base_path = os.path.dirname(os.path.abspath(__file__))
 
     return os.path.join(base_path, relative_path)
+
+
+QUNS_BUSY = 2                      # A fullscreen app is in the foreground
+QUNS_RUNNING_D3D_FULL_SCREEN = 3   # An exclusive-fullscreen Direct3D game
+MONITOR_DEFAULTTONEAREST = 2
+
+
+def covered_by_fullscreen_app(hwnd):
+    """Windows: whether another app is fullscreen on the monitor showing hwnd. Always False elsewhere.
+
+    Qt 5 on Windows never reports a covered window as unexposed, so this is
+    the one occlusion case we can detect there (games, OBS fullscreen projectors).
+    """
+    if sys.platform != "win32":
+        return False
+    try:
+        import ctypes
+        from ctypes import wintypes
+        state = ctypes.c_int(0)
+        if ctypes.windll.shell32.SHQueryUserNotificationState(ctypes.byref(state)) != 0:
+            return False
+        if state.value not in (QUNS_BUSY, QUNS_RUNNING_D3D_FULL_SCREEN):
+            return False
+        user32 = ctypes.windll.user32
+        user32.GetForegroundWindow.restype = wintypes.HWND
+        user32.MonitorFromWindow.argtypes = [wintypes.HWND, wintypes.DWORD]
+        user32.MonitorFromWindow.restype = wintypes.HMONITOR
+        foreground = user32.GetForegroundWindow()
+        if not foreground or foreground == hwnd:
+            return False
+        # A fullscreen app on another monitor does not cover us
+        return (user32.MonitorFromWindow(foreground, MONITOR_DEFAULTTONEAREST)
+                == user32.MonitorFromWindow(hwnd, MONITOR_DEFAULTTONEAREST))
+    except Exception:
+        return False
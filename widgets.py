@@ -1,8 +1,90 @@
+import time
+from collections import deque
 from PyQt5.QtWidgets import QLabel, QWidget, QGraphicsDropShadowEffect
-from PyQt5.QtCore import Qt, QPoint, QRect, QSize
+from PyQt5.QtCore import Qt, QObject, QPoint, QRect, QSize, QTimer
 from PyQt5.QtGui import QFont, QColor
 
+
+class FrameCoalescer(QObject):
+    """Collapses a burst of mouse moves into at most one geometry pass per frame.
+
+    Move handlers post() only the latest pointer state; apply(state) runs on
+    the leading edge and then at most once every FRAME_MS, so high polling
+    rate mice cannot drive more than ~60 layout passes per second.
+    """
+    FRAME_MS = 16
+
+    def __init__(self, apply, parent=None):
+        super().__init__(parent)
+        self.apply = apply
+        self.pending = None
+        self._last_apply = 0.0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self.flush)
+        
+        # Stats: posted events vs applied passes, and the times of the passes in the last second
+        self.posted = 0
+        self.passes = 0
+        self._recent = deque()
+
+    def post(self, state):
+        self.posted += 1
+        self.pending = state
+        if self._timer.isActive():
+            return
+        wait_ms = self.FRAME_MS - (time.monotonic() - self._last_apply) * 1000
+        if wait_ms <= 0:
+            self.flush()
+        else:
+            self._timer.start(int(wait_ms) + 1)
+
+    def flush(self):
+        """Apply the latest pending state now (also used on mouse release)."""
+        self._timer.stop()
+        state, self.pending = self.pending, None
+        if state is None:
+            return
+        now = time.monotonic()
+        self._last_apply = now
+        self.passes += 1
+        self._recent.append(now)
+        self._expire(now)
+        self.apply(state)
+
+    @property
+    def passes_per_second(self):
+        """Passes applied during the last second, up to now."""
+        self._expire(time.monotonic())
+        return len(self._recent)
+
+    def _expire(self, now):
+        while self._recent and now - self._recent[0] > 1.0:
+            self._recent.popleft()
+
+
+def batched_geometry(window):
+    """Context for one geometry pass: no repaints in between, one invalidate at the end."""
+    return _BatchedGeometry(window)
+
+
+class _BatchedGeometry:
+    def __init__(self, window):
+        self.window = window
+
+    def __enter__(self):
+        self.window.setUpdatesEnabled(False)
+        return self.window
+
+    def __exit__(self, *exc):
+        self.window.setUpdatesEnabled(True)
+        self.window.update()
+        return False
+
 class DraggableLabel(QLabel):
+    HQ_DELAY_MS = 150  # Idle time before a drag-in-progress gets its smooth rescale
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setMouseTracking(True)  # Enable mouse tracking for hover effects
@@ -17,15 +99,46 @@ class DraggableLabel(QLabel):
         self.window_start_pos = None # For window dragging
         
         self._original_pixmap = None  # Store original pixmap for scaling
+        self._loader = None  # AssetLoader providing cached scaled glyphs
+        self._glyph = None
+        self._shown_key = None  # cacheKey of the pixmap currently on the label
+        
+        # Two-phase scaling: nearest-neighbour while resizing, one smooth pass after
+        self.interactive = False
+        self._hq_timer = QTimer(self)
+        self._hq_timer.setSingleShot(True)
+        self._hq_timer.timeout.connect(self.apply_high_quality)
         
         # Callbacks
         self.on_resize_start = None
         self.on_resize = None
+        
+        # Edit-mode drags apply the latest pointer position once per frame
+        self.coalescer = FrameCoalescer(self.apply_pointer, self)
 
     def setPixmap(self, pixmap):
+        self._loader = None
+        self._glyph = None
         self._original_pixmap = pixmap
         self.update_scaled_pixmap()
-    
+
+    def set_glyph(self, loader, glyph):
+        """Show a named asset glyph; scaled copies come from the loader's shared cache."""
+        self._loader = loader
+        self._glyph = glyph
+        self._original_pixmap = None  # Never needed: the loader scales (or loads) on demand
+        self.update_scaled_pixmap()
+
+    def refresh_glyph(self, glyphs):
+        """Asset hot-reload: redraw if this label shows one of the changed glyphs."""
+        if self._glyph not in glyphs:
+            return
+        self._shown_key = None
+        if not self._loader.has(self._glyph):
+            self.clear()
+            return
+        self.update_scaled_pixmap()
+
     def resizeEvent(self, event):
         try:
             self.update_scaled_pixmap()
@@ -33,18 +146,41 @@ class DraggableLabel(QLabel):
         except Exception as e:
             print(f"Error in DraggableLabel.resizeEvent: {e}")
         
-    def update_scaled_pixmap(self):
+    def update_scaled_pixmap(self, smooth=None):
+        if smooth is None:
+            smooth = not self.interactive
         try:
-            if self._original_pixmap and not self._original_pixmap.isNull() and self.width() > 1 and self.height() > 1:
-                scaled = self._original_pixmap.scaled(
-                    self.size(), 
-                    Qt.IgnoreAspectRatio, 
-                    Qt.SmoothTransformation
-                )
+            if self.width() > 1 and self.height() > 1:
+                if self._glyph is not None:
+                    scaled = self._loader.scaled(self._glyph, self.size(), self.devicePixelRatioF(), smooth)
+                elif self._original_pixmap and not self._original_pixmap.isNull():
+                    scaled = self._original_pixmap.scaled(
+                        self.size(), 
+                        Qt.IgnoreAspectRatio, 
+                        Qt.SmoothTransformation if smooth else Qt.FastTransformation
+                    )
+                else:
+                    return
+                if not smooth:
+                    self._hq_timer.start(self.HQ_DELAY_MS)
+                if scaled is None or scaled.cacheKey() == self._shown_key:
+                    return
+                self._shown_key = scaled.cacheKey()
                 super().setPixmap(scaled)
         except Exception as e:
             print(f"Error scaling pixmap: {e}")
 
+    def begin_interactive_scaling(self):
+        self.interactive = True
+
+    def end_interactive_scaling(self):
+        self.interactive = False
+        self.apply_high_quality()
+
+    def apply_high_quality(self):
+        self._hq_timer.stop()
+        self.update_scaled_pixmap(smooth=True)
+
     def set_editing(self, editing):
         self.is_editing = editing
         self.update_style()
@@ -77,6 +213,7 @@ class DraggableLabel(QLabel):
                 self.resizing = True
                 self.resize_start_pos = event.globalPos()
                 self.initial_geometry = self.geometry()
+                self.begin_interactive_scaling()
                 if self.on_resize_start:
                     self.on_resize_start()
             else:
@@ -100,55 +237,65 @@ class DraggableLabel(QLabel):
         else:
             self.setCursor(Qt.SizeAllCursor)
 
-        if self.dragging:
-            delta = event.globalPos() - self.drag_start_global
-            target_global = self.initial_global_pos + delta
-            if self.parent():
-                target_local = self.parent().mapFromGlobal(target_global)
-                margin = 20
-                mw = main_window.width()
-                mh = main_window.height()
-                new_x = max(margin, min(target_local.x(), mw - self.width() - margin))
-                new_y = max(margin, min(target_local.y(), mh - self.height() - margin))
-                self.move(new_x, new_y)
+        if self.dragging or self.resizing:
+            self.coalescer.post((event.globalPos(), event.modifiers()))
+
+    def apply_pointer(self, state):
+        global_pos, modifiers = state
+        main_window = self.window()
+        with batched_geometry(main_window):
+            if self.dragging:
+                delta = global_pos - self.drag_start_global
+                target_global = self.initial_global_pos + delta
+                if self.parent():
+                    target_local = self.parent().mapFromGlobal(target_global)
+                    margin = 20
+                    mw = main_window.width()
+                    mh = main_window.height()
+                    new_x = max(margin, min(target_local.x(), mw - self.width() - margin))
+                    new_y = max(margin, min(target_local.y(), mh - self.height() - margin))
+                    self.move(new_x, new_y)
             
-            # Update container to fit new digit position
-            if hasattr(main_window, 'update_container_geometry'):
-                main_window.update_container_geometry()
+                # Update container to fit new digit position
+                if hasattr(main_window, 'update_container_geometry'):
+                    main_window.update_container_geometry()
             
-            # Ensure bounds call moved to mouseReleaseEvent to prevent crash/recursive loops
+                # Ensure bounds call moved to mouseReleaseEvent to prevent crash/recursive loops
             
-        elif self.resizing:
-            # Resize widget
-            delta = event.globalPos() - self.resize_start_pos
+            elif self.resizing:
+                # Resize widget
+                delta = global_pos - self.resize_start_pos
             
-            # Check for Shift key (Keep Aspect Ratio)
-            keep_aspect_ratio = (event.modifiers() & Qt.ShiftModifier)
+                # Check for Shift key (Keep Aspect Ratio)
+                keep_aspect_ratio = (modifiers & Qt.ShiftModifier)
             
-            new_width = max(20, self.initial_geometry.width() + delta.x())
-            new_height = max(20, self.initial_geometry.height() + delta.y())
+                new_width = max(20, self.initial_geometry.width() + delta.x())
+                new_height = max(20, self.initial_geometry.height() + delta.y())
             
-            if keep_aspect_ratio and self.initial_geometry.height() > 0:
-                ratio = self.initial_geometry.width() / self.initial_geometry.height()
-                # Use the larger change to drive the resize
-                if abs(delta.x()) > abs(delta.y()):
-                    if ratio > 0.0001:
-                        new_height = int(new_width / ratio)
-                else:
-                    new_width = int(new_height * ratio)
+                if keep_aspect_ratio and self.initial_geometry.height() > 0:
+                    ratio = self.initial_geometry.width() / self.initial_geometry.height()
+                    # Use the larger change to drive the resize
+                    if abs(delta.x()) > abs(delta.y()):
+                        if ratio > 0.0001:
+                            new_height = int(new_width / ratio)
+                    else:
+                        new_width = int(new_height * ratio)
             
-            self.resize(new_width, new_height)
-            if self.on_resize:
-                self.on_resize()
+                self.resize(new_width, new_height)
+                if self.on_resize:
+                    self.on_resize()
             
-            # Update container to fit new digit size
-            if hasattr(main_window, 'update_container_geometry'):
-                main_window.update_container_geometry()
+                # Update container to fit new digit size
+                if hasattr(main_window, 'update_container_geometry'):
+                    main_window.update_container_geometry()
             
-            # Ensure bounds call moved to mouseReleaseEvent
+                # Ensure bounds call moved to mouseReleaseEvent
 
     def mouseReleaseEvent(self, event):
+        self.coalescer.flush()
         self.dragging = False
+        if self.resizing:
+            self.end_interactive_scaling()
         self.resizing = False
         
         main_window = self.window()
@@ -175,6 +322,9 @@ class ContainerWidget(QWidget):
         self.resize_start_pos = QPoint()
         self.initial_geometry = QRect()
         self.initial_digits_geo = []
+        
+        # Edit-mode drags apply the latest pointer position once per frame
+        self.coalescer = FrameCoalescer(self.apply_pointer, self)
 
     def mousePressEvent(self, event):
         main_window = self.window()
@@ -190,6 +340,8 @@ class ContainerWidget(QWidget):
                 self.initial_geometry = self.geometry()
                 # Capture initial state of all digits for scaling
                 self.initial_digits_geo = [lbl.geometry() for lbl in main_window.digit_labels]
+                for lbl in main_window.digit_labels:
+                    lbl.begin_interactive_scaling()
             else:
                 self.dragging = True
                 self.drag_start_global = event.globalPos()
@@ -208,76 +360,84 @@ class ContainerWidget(QWidget):
         else:
             self.setCursor(Qt.SizeAllCursor)
 
-        if self.dragging:
-            delta = event.globalPos() - self.drag_start_global
-            target_global = self.initial_global_pos + delta
-            if self.parent():
-                target_local = self.parent().mapFromGlobal(target_global)
-                margin = 10
-                mw = main_window.width()
-                mh = main_window.height()
-                new_x = max(margin, min(target_local.x(), mw - self.width() - margin))
-                new_y = max(margin, min(target_local.y(), mh - self.height() - margin))
-                self.move(new_x, new_y)
-                actual_global = self.parent().mapToGlobal(QPoint(new_x, new_y))
-                actual_delta_global = actual_global - self.initial_global_pos
-            
-            # Move all digits by the same delta (using global logic)
-            for i, lbl in enumerate(main_window.digit_labels):
-                if i < len(self.initial_digit_global_positions):
-                    t_global = self.initial_digit_global_positions[i] + actual_delta_global
-                    t_local = main_window.central_widget.mapFromGlobal(t_global)
-                    lbl.move(t_local)
+        if self.dragging or self.resizing:
+            self.coalescer.post((event.globalPos(), event.modifiers()))
+
+    def apply_pointer(self, state):
+        global_pos, modifiers = state
+        main_window = self.window()
+        # One batched pass per frame; batched_geometry ends with main_window.update()
+        with batched_geometry(main_window):
+            if self.dragging:
+                delta = global_pos - self.drag_start_global
+                target_global = self.initial_global_pos + delta
+                if self.parent():
+                    target_local = self.parent().mapFromGlobal(target_global)
+                    margin = 10
+                    mw = main_window.width()
+                    mh = main_window.height()
+                    new_x = max(margin, min(target_local.x(), mw - self.width() - margin))
+                    new_y = max(margin, min(target_local.y(), mh - self.height() - margin))
+                    self.move(new_x, new_y)
+                    actual_global = self.parent().mapToGlobal(QPoint(new_x, new_y))
+                    actual_delta_global = actual_global - self.initial_global_pos
             
-            main_window.update() 
+                # Move all digits by the same delta (using global logic)
+                for i, lbl in enumerate(main_window.digit_labels):
+                    if i < len(self.initial_digit_global_positions):
+                        t_global = self.initial_digit_global_positions[i] + actual_delta_global
+                        t_local = main_window.central_widget.mapFromGlobal(t_global)
+                        lbl.move(t_local)
             
-        elif self.resizing:
-            delta = event.globalPos() - self.resize_start_pos
+            elif self.resizing:
+                delta = global_pos - self.resize_start_pos
             
-            new_w = max(50, self.initial_geometry.width() + delta.x())
-            new_h = max(50, self.initial_geometry.height() + delta.y())
+                new_w = max(50, self.initial_geometry.width() + delta.x())
+                new_h = max(50, self.initial_geometry.height() + delta.y())
             
-            keep_aspect_ratio = (event.modifiers() & Qt.ShiftModifier)
-            if keep_aspect_ratio and self.initial_geometry.height() > 0:
-                ratio = self.initial_geometry.width() / self.initial_geometry.height()
-                if abs(delta.x()) > abs(delta.y()):
-                    if ratio > 0.0001:
-                        new_h = int(new_w / ratio)
-                else:
-                    new_w = int(new_h * ratio)
-            margin = 10
-            mw = main_window.width()
-            mh = main_window.height()
-            # Clamp size to available space without moving window
-            max_w = max(50, mw - self.x() - margin)
-            max_h = max(50, mh - self.y() - margin)
-            new_w = min(new_w, max_w)
-            new_h = min(new_h, max_h)
-            self.resize(new_w, new_h)
+                keep_aspect_ratio = (modifiers & Qt.ShiftModifier)
+                if keep_aspect_ratio and self.initial_geometry.height() > 0:
+                    ratio = self.initial_geometry.width() / self.initial_geometry.height()
+                    if abs(delta.x()) > abs(delta.y()):
+                        if ratio > 0.0001:
+                            new_h = int(new_w / ratio)
+                    else:
+                        new_w = int(new_h * ratio)
+                margin = 10
+                mw = main_window.width()
+                mh = main_window.height()
+                # Clamp size to available space without moving window
+                max_w = max(50, mw - self.x() - margin)
+                max_h = max(50, mh - self.y() - margin)
+                new_w = min(new_w, max_w)
+                new_h = min(new_h, max_h)
+                self.resize(new_w, new_h)
             
-            scale_x = new_w / self.initial_geometry.width()
-            scale_y = new_h / self.initial_geometry.height()
+                scale_x = new_w / self.initial_geometry.width()
+                scale_y = new_h / self.initial_geometry.height()
             
-            for i, lbl in enumerate(main_window.digit_labels):
-                orig_geo = self.initial_digits_geo[i]
+                for i, lbl in enumerate(main_window.digit_labels):
+                    orig_geo = self.initial_digits_geo[i]
                 
-                # Calculate new position relative to container's top-left
-                rel_x = orig_geo.x() - self.initial_geometry.x()
-                rel_y = orig_geo.y() - self.initial_geometry.y()
+                    # Calculate new position relative to container's top-left
+                    rel_x = orig_geo.x() - self.initial_geometry.x()
+                    rel_y = orig_geo.y() - self.initial_geometry.y()
                 
-                new_rel_x = rel_x * scale_x
-                new_rel_y = rel_y * scale_y
+                    new_rel_x = rel_x * scale_x
+                    new_rel_y = rel_y * scale_y
                 
-                new_x = self.x() + int(new_rel_x)
-                new_y = self.y() + int(new_rel_y)
+                    new_x = self.x() + int(new_rel_x)
+                    new_y = self.y() + int(new_rel_y)
                 
-                new_lbl_w = int(orig_geo.width() * scale_x)
-                new_lbl_h = int(orig_geo.height() * scale_y)
+                    new_lbl_w = int(orig_geo.width() * scale_x)
+                    new_lbl_h = int(orig_geo.height() * scale_y)
                 
-                lbl.setGeometry(new_x, new_y, new_lbl_w, new_lbl_h)
-            
-            main_window.update()
+                    lbl.setGeometry(new_x, new_y, new_lbl_w, new_lbl_h)
 
     def mouseReleaseEvent(self, event):
+        self.coalescer.flush()
+        if self.resizing:
+            for lbl in self.window().digit_labels:
+                lbl.end_interactive_scaling()
         self.dragging = False
         self.resizing = False